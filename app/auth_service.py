@@ -5,9 +5,9 @@ from typing import Optional, Dict, Any
 from .models import UserRole, UserRegistration, UserResponse, WorkerProfile
 from .database import (
     create_user, get_user_by_email, create_worker_profile,
-    get_worker_by_email, get_department_by_id, create_department, get_all_departments
+    get_worker_by_email, get_department_by_id, create_departments, get_all_departments
 )
-from datetime import datetime
+from .utils import now_dt, format_timestamp
 import hashlib
 import secrets
 
@@ -76,7 +76,7 @@ class AuthService:
                 "phone": user_data.phone,
                 "role": user_data.role.value,
                 "is_active": True,
-                "created_at": datetime.now().strftime("%H:%M %d-%m-%Y"),
+                "created_at": now_dt(),
                 "firebase_uid": firebase_user.uid if firebase_user else None
             }
 
@@ -95,7 +95,7 @@ class AuthService:
                     "skills": user_data.skills or [],
                     "profile_photo": user_data.profile_photo,
                     "is_active": True,
-                    "created_at": datetime.now().strftime("%H:%M %d-%m-%Y")
+                    "created_at": now_dt()
                 }
                 await create_worker_profile(worker_data)
 
@@ -109,7 +109,7 @@ class AuthService:
                     "role": user_data.role.value,
                     "phone": user_data.phone,
                     "is_active": True,
-                    "created_at": created_user["created_at"]
+                    "created_at": format_timestamp(created_user["created_at"])
                 }
             }
 
@@ -148,7 +148,7 @@ class AuthService:
                     "role": user["role"],
                     "phone": user.get("phone"),
                     "is_active": user.get("is_active", True),
-                    "created_at": user["created_at"]
+                    "created_at": format_timestamp(user["created_at"])
                 }
             }
 
@@ -186,7 +186,7 @@ class AuthService:
                     "role": user["role"],
                     "phone": user.get("phone"),
                     "is_active": user.get("is_active", True),
-                    "created_at": user["created_at"]
+                    "created_at": format_timestamp(user["created_at"])
                 }
             }
 
@@ -222,10 +222,9 @@ class AuthService:
         try:
             existing_depts = await get_all_departments()
             existing_names = {dept.name for dept in existing_depts}
-            for dept_data in default_departments:
-                if dept_data["name"] not in existing_names:
-                    await create_department(dept_data)
-                    print(f"Created default department: {dept_data['name']}")
+            missing = [d for d in default_departments if d["name"] not in existing_names]
+            for dept in await create_departments(missing):
+                print(f"Created default department: {dept.name}")
         except Exception as e:
             print(f"Error initializing default departments: {e}")
 
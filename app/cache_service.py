@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+import redis.asyncio as redis_asyncio
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+class CacheService:
+    """
+    Short-TTL JSON response cache.
+
+    Uses Redis when REDIS_URL is configured so every worker shares the same
+    cache; otherwise falls back to a bounded in-process cache for development.
+    """
+
+    def __init__(self, prefix: str = "smseva", max_local_entries: int = 1024):
+        self.redis_url = os.getenv("REDIS_URL")
+        self.prefix = prefix
+        self.max_local_entries = max_local_entries
+
+        # key -> (expires_at, json string)
+        self._local: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        # namespace -> generation, for the in-process cache (Redis keeps its own)
+        self._generations: dict = {}
+
+        self.redis = None
+        if self.redis_url:
+            try:
+                self.redis = redis_asyncio.from_url(self.redis_url)
+                logger.info("Cache service using Redis")
+            except Exception as e:
+                logger.warning("Could not create Redis client, using in-process cache: %s", e)
+                self.redis = None
+        else:
+            logger.info("REDIS_URL not configured. Using in-process cache.")
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _generation_key(self, namespace: str) -> str:
+        return f"{self.prefix}:generation:{namespace}"
+
+    async def _versioned_key(self, key: str) -> str:
+        """
+        Keys are "<namespace>:<rest>". The namespace's current generation is
+        part of the stored key, so clearing a namespace only has to bump it.
+        """
+        namespace, _, rest = key.partition(":")
+        if self.redis is not None:
+            generation = await self.redis.get(self._generation_key(namespace))
+            generation = int(generation) if generation is not None else 0
+        else:
+            generation = self._generations.get(namespace, 0)
+        return self._key(f"{namespace}:{generation}:{rest}")
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        if self.redis is not None:
+            try:
+                cached = await self.redis.get(await self._versioned_key(key))
+                return json.loads(cached) if cached is not None else None
+            except Exception as e:
+                logger.warning("Redis GET failed for %s: %s", key, e)
+                return None
+
+        full_key = await self._versioned_key(key)
+        entry = self._local.get(full_key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            self._local.pop(full_key, None)
+            return None
+        return json.loads(payload)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """Cache a JSON-serializable value for ttl seconds"""
+        payload = json.dumps(value)
+
+        if self.redis is not None:
+            try:
+                await self.redis.set(await self._versioned_key(key), payload, ex=ttl)
+            except Exception as e:
+                logger.warning("Redis SET failed for %s: %s", key, e)
+            return
+
+        full_key = await self._versioned_key(key)
+        self._local[full_key] = (time.monotonic() + ttl, payload)
+        self._local.move_to_end(full_key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+    async def add(self, key: str, ttl: int) -> Optional[bool]:
+        """
+        Atomically claim key for ttl seconds (Redis SET NX) - True if it was new,
+        False if it was already claimed. Returns None when no Redis is available,
+        since an in-process claim can't be seen by other workers.
+        """
+        if self.redis is None:
+            return None
+
+        full_key = self._key(key)
+        try:
+            return bool(await self.redis.set(full_key, "1", nx=True, ex=ttl))
+        except Exception as e:
+            logger.warning("Redis SET NX failed for %s: %s", full_key, e)
+            return None
+
+    async def clear(self, namespace: str) -> None:
+        """
+        Invalidate every cached key under the given namespace by moving it to a
+        new generation - a single INCR, however large the cache is. Entries of
+        older generations are never read again and simply expire by TTL.
+        """
+        if self.redis is not None:
+            try:
+                await self.redis.incr(self._generation_key(namespace))
+            except Exception as e:
+                logger.warning("Redis clear failed for namespace %s: %s", namespace, e)
+            return
+
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+# Create a singleton instance
+cache_service = CacheService()
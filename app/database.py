@@ -1,28 +1,49 @@
+import asyncio
 import motor.motor_asyncio
-import hashlib
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+import xxhash
 import re
-from typing import Optional, List
+import logging
+from typing import Optional, List, Tuple, AsyncIterator
+from datetime import datetime
 from .models import IssueDB, Department, WorkerProfile, IssueAssignment, UserRole
+from .cache_service import cache_service
+from .utils import now_dt
 import os
 from dotenv import load_dotenv
 from difflib import SequenceMatcher
-from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database configuration
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "municipal_issues")
 
+# Connections kept open (and opened at startup) so requests don't pay for the handshake
+MONGO_MIN_POOL_SIZE = 5
+
 # Create motor client with proper error handling
 try:
-    client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URL)
+    client = motor.motor_asyncio.AsyncIOMotorClient(
+        MONGODB_URL,
+        maxPoolSize=50,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=60000,
+        waitQueueTimeoutMS=2000,
+        serverSelectionTimeoutMS=5000
+    )
     database = client[DATABASE_NAME]
     issues_collection = database.issues
     departments_collection = database.departments
     workers_collection = database.workers
     assignments_collection = database.assignments
     users_collection = database.users
+    migrations_collection = database.migrations
 except Exception as e:
     print(f"Warning: Could not connect to MongoDB: {e}")
     print("Using in-memory storage for development")
@@ -33,11 +54,90 @@ except Exception as e:
     workers_collection = None
     assignments_collection = None
     users_collection = None
+    migrations_collection = None
+
+# Cache namespace for issue listings/counts - cleared whenever an issue changes
+ISSUES_CACHE_NAMESPACE = "issues"
+
+async def invalidate_issue_caches():
+    """Drop cached issue listings and counts after an issue is written"""
+    await cache_service.clear(ISSUES_CACHE_NAMESPACE)
+
+# Cache namespace for worker listings - cleared whenever a worker profile changes
+WORKERS_CACHE_NAMESPACE = "workers"
+
+async def invalidate_worker_caches():
+    """Drop cached worker listings after a worker profile is written"""
+    await cache_service.clear(WORKERS_CACHE_NAMESPACE)
+
+async def warm_up_connection_pool():
+    """Ping MongoDB so the pool opens its connections before the first request"""
+    if client is None:
+        return
+    
+    try:
+        # Concurrent pings each check out their own connection, filling the pool
+        await asyncio.gather(*[client.admin.command("ping") for _ in range(MONGO_MIN_POOL_SIZE)])
+        logger.info("Database: MongoDB connection pool ready")
+    except Exception as e:
+        logger.error("Database: MongoDB ping failed: %s", e)
+
+# (collection, keys) of the unique indexes ensure_indexes managed to create.
+# Writes that rely on a unique index for duplicate protection check this and
+# fall back to an explicit lookup while the index is missing
+_unique_indexes_ready = set()
+
+async def ensure_indexes():
+    """Create the indexes used by hot lookups. create_index is idempotent, so this is safe on every startup"""
+    index_specs = [
+        ("issues", issues_collection, [
+            ("ticket_id", {"unique": True}),
+            ("content_hash", {}),
+            # Per-user issue lists, returned in insertion order
+            ([("users", 1), ("_id", 1)], {}),
+            # /issues/unassigned
+            ([("assigned", 1), ("_id", 1)], {}),
+            # Filtered /issues pages, sorted by _id
+            ([("category", 1), ("status", 1), ("_id", 1)], {}),
+            ([("status", 1), ("_id", 1)], {}),
+            # Duplicate detection narrows same-category issues by coordinates
+            ([("category", 1), ("location.latitude", 1), ("location.longitude", 1)], {}),
+        ]),
+        ("assignments", assignments_collection, [
+            ("ticket_id", {"unique": True}),
+            # Also serves plain assigned_to lookups as a prefix
+            ([("assigned_to", 1), ("status", 1)], {}),
+        ]),
+        ("workers", workers_collection, [
+            ("email", {}),
+            ([("department_id", 1), ("is_active", 1)], {}),
+        ]),
+        ("users", users_collection, [
+            ("email", {}),
+        ]),
+    ]
+    
+    for name, collection, indexes in index_specs:
+        if collection is None:
+            continue
+        # One try per index so a bad index (e.g. existing duplicates) doesn't skip the rest
+        ensured = True
+        for keys, options in indexes:
+            try:
+                await collection.create_index(keys, **options)
+                if options.get("unique"):
+                    _unique_indexes_ready.add((name, str(keys)))
+            except Exception as e:
+                ensured = False
+                logger.error("Database: Error creating %s index %s: %s", name, keys, e)
+        if ensured:
+            logger.info("Database: %s indexes ensured", name)
 
 # Configuration for duplicate detection
 LOCATION_THRESHOLD_KM = 0.5  # 500 meters
 CONTENT_SIMILARITY_THRESHOLD = 0.7  # 70% similarity
 CATEGORY_MATCH_REQUIRED = True
+MAX_SIMILARITY_CANDIDATES = 200  # newest same-category issues scanned per lookup
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Calculate distance between two points using Haversine formula (in km)"""
@@ -82,16 +182,24 @@ def extract_keywords(text: str) -> List[str]:
     keywords = [word for word in words if word not in common_words and len(word) > 2]
     return keywords
 
+@lru_cache(maxsize=4096)
+def _content_hash(text: str, longitude: Optional[float], latitude: Optional[float]) -> str:
+    """Hash text + coordinates; memoized so repeated submissions skip the work"""
+    content = text.lower().strip()
+    if longitude is not None:
+        content += f"_{longitude}_{latitude}"
+    
+    # Non-cryptographic 128-bit hash - same 32 hex chars as the old md5 digest
+    return xxhash.xxh3_128_hexdigest(content.encode())
+
 async def create_content_hash(text: str, location: Optional[dict] = None) -> str:
     """Create a hash of the content for duplicate detection"""
-    content = text.lower().strip()
     if location:
-        content += f"_{location.get('longitude', 0)}_{location.get('latitude', 0)}"
-    
-    return hashlib.md5(content.encode()).hexdigest()
+        return _content_hash(text, location.get('longitude', 0), location.get('latitude', 0))
+    return _content_hash(text, None, None)
 
-async def is_similar_issue(new_text: str, new_location: Optional[dict], new_category: str, 
-                          existing_issue: dict, user_email: str = None) -> bool:
+def is_similar_issue(new_text: str, new_location: Optional[dict], new_category: str, 
+                    existing_issue: dict, user_email: str = None) -> bool:
     """Check if new issue is similar to existing issue"""
     
     # 0. Check if same user already reported this issue
@@ -135,58 +243,129 @@ async def is_similar_issue(new_text: str, new_location: Optional[dict], new_cate
     
     return False
 
+# Similarity scoring (SequenceMatcher over every candidate) is CPU-bound, so it
+# gets its own pool instead of running on the event loop
+_SIMILARITY_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="similarity")
+
 # In-memory storage for development when MongoDB is not available
 _in_memory_issues = []
+# ticket_id -> issue, kept alongside the list so ticket lookups don't scan it
+_in_memory_issues_by_ticket = {}
 _in_memory_departments = []
 _in_memory_workers = []
 _in_memory_assignments = []
 _in_memory_users = []
 
+def _nearby_location_filter(location: Optional[dict]) -> Optional[dict]:
+    """
+    Bounding box around location that covers LOCATION_THRESHOLD_KM, so the
+    similarity candidates can be narrowed in the query. Issues without a
+    usable coordinates are kept since is_similar_issue doesn't reject those
+    on distance.
+    """
+    from math import radians, cos
+    if not location:
+        return None
+    lat = location.get('latitude')
+    lon = location.get('longitude')
+    # Same conditions under which is_similar_issue actually compares distances
+    if not lat or not lon or not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
+        return None
+    
+    lat_delta = LOCATION_THRESHOLD_KM / 111.32
+    lon_delta = LOCATION_THRESHOLD_KM / (111.32 * max(cos(radians(lat)), 0.01))
+    return {"$or": [
+        {
+            "location.latitude": {"$gte": lat - lat_delta, "$lte": lat + lat_delta},
+            "location.longitude": {"$gte": lon - lon_delta, "$lte": lon + lon_delta},
+        },
+        # No usable coordinates on the stored issue
+        {"location.latitude": {"$in": [None, 0]}},
+        {"location.longitude": {"$in": [None, 0]}},
+    ]}
+
+def _first_similar_issue(text: str, location: Optional[dict], category: str,
+                         candidates: List[dict], user_email: Optional[str]) -> Optional[dict]:
+    """Return the first candidate that is_similar_issue accepts"""
+    for issue in candidates:
+        if is_similar_issue(text, location, category, issue, user_email):
+            return issue
+    return None
+
+async def _find_similar_off_loop(text: str, location: Optional[dict], category: str,
+                                 candidates: List[dict], user_email: Optional[str]) -> Optional[dict]:
+    """Run the similarity scan on the similarity pool so it doesn't stall the event loop"""
+    if not candidates:
+        return None
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _SIMILARITY_POOL, _first_similar_issue, text, location, category, candidates, user_email
+    )
+
 async def find_existing_issue(content_hash: str, text: str = None, location: dict = None, category: str = None, user_email: str = None) -> Optional[IssueDB]:
     """Find existing issue by content hash or similarity"""
     
-    # First, try exact hash match
     if issues_collection is not None:
         try:
-            issue_data = await issues_collection.find_one({"content_hash": content_hash})
-            if issue_data:
-                # Convert ObjectId to string
-                if "_id" in issue_data:
+            if text and category:
+                # Exact hash match and similarity candidates in one round trip,
+                # with the exact match sorted first so it still wins; the rest
+                # are capped to the newest MAX_SIMILARITY_CANDIDATES
+                candidates = {"category": category}
+                nearby = _nearby_location_filter(location)
+                if nearby:
+                    candidates.update(nearby)
+                cursor = issues_collection.aggregate([
+                    {"$match": {"$or": [{"content_hash": content_hash}, candidates]}},
+                    {"$addFields": {"_exact_match": {"$eq": ["$content_hash", content_hash]}}},
+                    {"$sort": {"_exact_match": -1, "_id": -1}},
+                    {"$limit": MAX_SIMILARITY_CANDIDATES + 1},
+                    # The similarity check never reads the photo; the match is reloaded whole below
+                    {"$project": {"photo": 0}},
+                ])
+                similar_candidates = []
+                match = None
+                async for issue_data in cursor:
+                    if issue_data.pop("_exact_match", False):
+                        match = issue_data
+                        break
+                    similar_candidates.append(issue_data)
+                
+                if match is None:
+                    match = await _find_similar_off_loop(text, location, category, similar_candidates, user_email)
+                if match:
+                    issue_data = await issues_collection.find_one({"_id": match["_id"]}) or match
                     issue_data["_id"] = str(issue_data["_id"])
-                return IssueDB(**issue_data)
+                    return IssueDB.model_validate(issue_data)
+            else:
+                issue_data = await issues_collection.find_one({"content_hash": content_hash})
+                if issue_data:
+                    # Convert ObjectId to string
+                    if "_id" in issue_data:
+                        issue_data["_id"] = str(issue_data["_id"])
+                    return IssueDB.model_validate(issue_data)
         except Exception as e:
             print(f"Error querying MongoDB: {e}")
     
     # Use in-memory storage for exact match
     for issue in _in_memory_issues:
         if issue.get("content_hash") == content_hash:
-            return IssueDB(**issue)
+            return IssueDB.model_validate(issue)
     
     # If no exact match and we have text/location/category, try similarity matching
     if text and category:
-        if issues_collection is not None:
-            try:
-                # Get all issues of the same category
-                cursor = issues_collection.find({"category": category})
-                async for issue_data in cursor:
-                    if "_id" in issue_data:
-                        issue_data["_id"] = str(issue_data["_id"])
-                    
-                    if await is_similar_issue(text, location, category, issue_data, user_email):
-                        return IssueDB(**issue_data)
-            except Exception as e:
-                print(f"Error similarity matching in MongoDB: {e}")
-        
         # Check in-memory storage for similarity
-        for issue in _in_memory_issues:
-            if issue.get("category") == category:
-                if await is_similar_issue(text, location, category, issue, user_email):
-                    return IssueDB(**issue)
+        same_category = [issue for issue in _in_memory_issues if issue.get("category") == category]
+        issue = await _find_similar_off_loop(text, location, category, same_category, user_email)
+        if issue:
+            return IssueDB.model_validate(issue)
     
     return None
 
 async def create_new_issue(issue_data: dict) -> IssueDB:
     """Create a new issue in the database"""
+    # New issues start out unassigned - see set_issue_assigned
+    issue_data.setdefault("assigned", False)
     if issues_collection is not None:
         try:
             result = await issues_collection.insert_one(issue_data)
@@ -197,12 +376,15 @@ async def create_new_issue(issue_data: dict) -> IssueDB:
             import uuid
             issue_data["_id"] = str(uuid.uuid4())
             _in_memory_issues.append(issue_data)
+            _in_memory_issues_by_ticket[issue_data["ticket_id"]] = issue_data
     else:
         # Use in-memory storage
         import uuid
         issue_data["_id"] = str(uuid.uuid4())
         _in_memory_issues.append(issue_data)
-    return IssueDB(**issue_data)
+        _in_memory_issues_by_ticket[issue_data["ticket_id"]] = issue_data
+    await invalidate_issue_caches()
+    return IssueDB.model_validate(issue_data)
 
 async def update_existing_issue(issue_id: str, new_email: str) -> IssueDB:
     """Update existing issue by adding new user email and incrementing count"""
@@ -221,7 +403,8 @@ async def update_existing_issue(issue_id: str, new_email: str) -> IssueDB:
                 # Convert ObjectId to string
                 if "_id" in result:
                     result["_id"] = str(result["_id"])
-                return IssueDB(**result)
+                await invalidate_issue_caches()
+                return IssueDB.model_validate(result)
         except Exception as e:
             print(f"Error updating MongoDB: {e}")
     
@@ -233,7 +416,8 @@ async def update_existing_issue(issue_id: str, new_email: str) -> IssueDB:
             if new_email not in issue["users"]:
                 issue["users"].append(new_email)
             issue["issue_count"] = issue.get("issue_count", 1) + 1
-            return IssueDB(**issue)
+            await invalidate_issue_caches()
+            return IssueDB.model_validate(issue)
     return None
 
 async def get_all_issues() -> list[IssueDB]:
@@ -246,114 +430,194 @@ async def get_all_issues() -> list[IssueDB]:
                 # Convert ObjectId to string
                 if "_id" in issue:
                     issue["_id"] = str(issue["_id"])
-                issues.append(IssueDB(**issue))
+                issues.append(IssueDB.model_validate(issue))
             return issues
         except Exception as e:
             print(f"Error querying MongoDB: {e}")
     
     # Use in-memory storage
-    return [IssueDB(**issue) for issue in _in_memory_issues]
+    return [IssueDB.model_validate(issue) for issue in _in_memory_issues]
+
+def _build_issue_filter(category: Optional[str] = None, status: Optional[str] = None) -> dict:
+    """Build the MongoDB filter for the optional category/status issue filters"""
+    query = {}
+    if category:
+        query["category"] = category
+    if status:
+        query["status"] = status
+    return query
+
+async def get_filtered_issues(category: Optional[str] = None, status: Optional[str] = None,
+                              skip: int = 0, limit: int = 100, lite: bool = False) -> list[IssueDB]:
+    """
+    Get one page of issues matching the optional category/status filters.
+    With lite=True the photo field is left out of the query results.
+    """
+    query = _build_issue_filter(category, status)
+    projection = {"photo": 0} if lite else None
+
+    if issues_collection is not None:
+        try:
+            # Sort on _id (insertion order) so skip/limit pages are stable
+            cursor = issues_collection.find(query, projection).sort("_id", 1).skip(skip).limit(limit)
+            issues = []
+            async for issue in cursor:
+                # Convert ObjectId to string
+                if "_id" in issue:
+                    issue["_id"] = str(issue["_id"])
+                issues.append(IssueDB.model_validate(issue))
+            return issues
+        except Exception as e:
+            logger.error("Error querying filtered issues from MongoDB: %s", e)
+
+    # Use in-memory storage
+    matching = [
+        issue for issue in _in_memory_issues
+        if all(issue.get(field) == value for field, value in query.items())
+    ]
+    if lite:
+        return [IssueDB.model_validate({**issue, "photo": None}) for issue in matching[skip:skip + limit]]
+    return [IssueDB.model_validate(issue) for issue in matching[skip:skip + limit]]
+
+async def count_filtered_issues(category: Optional[str] = None, status: Optional[str] = None) -> int:
+    """Count issues matching the optional category/status filters"""
+    query = _build_issue_filter(category, status)
+
+    if issues_collection is not None:
+        try:
+            return await issues_collection.count_documents(query)
+        except Exception as e:
+            logger.error("Error counting issues in MongoDB: %s", e)
+
+    # Use in-memory storage
+    return sum(
+        1 for issue in _in_memory_issues
+        if all(issue.get(field) == value for field, value in query.items())
+    )
+
+def _apply_status_change(issue: dict, new_status: str, updated_by_email: str, current_time: datetime) -> str:
+    """Apply a status change to an issue dict in place and return the previous status"""
+    previous_status = issue.get("status", "unknown")
+    issue["status"] = new_status
+    issue["updated_at"] = current_time
+    issue["updated_by_email"] = updated_by_email
+
+    # Track when status is changed to in_progress
+    if new_status == "in_progress" and previous_status != "in_progress":
+        issue["in_progress_at"] = current_time
+        # Clear awaiting confirmation flag when work restarts
+        issue["awaiting_user_confirmation"] = False
+
+    # Track when status is changed to completed
+    if new_status == "completed" and previous_status != "completed":
+        issue["completed_at"] = current_time
+        # Clear awaiting confirmation flag when fully completed
+        issue["awaiting_user_confirmation"] = False
+
+    # Set awaiting_user_confirmation flag when admin marks as completed
+    if new_status == "admin_completed" and previous_status != "admin_completed":
+        issue["awaiting_user_confirmation"] = True
+
+    return previous_status
 
 async def update_issue_status_in_db(ticket_id: str, new_status: str, updated_by_email: str) -> Optional[dict]:
     """Update issue status by ticket ID"""
-    print(f"Database: Updating status for ticket {ticket_id} to {new_status} by {updated_by_email}")
+    logger.debug("Database: Updating status for ticket %s to %s by %s", ticket_id, new_status, updated_by_email)
     
     if issues_collection is not None:
         try:
             from bson import ObjectId
-            print("Database: Using MongoDB")
-            
-            # Find the issue first to get current status
-            issue_data = await issues_collection.find_one({"ticket_id": ticket_id})
-            if not issue_data:
-                print(f"Database: No issue found with ticket_id {ticket_id}")
-                return None
-            
-            previous_status = issue_data.get("status", "unknown")
-            print(f"Database: Previous status was {previous_status}")
+            logger.debug("Database: Using MongoDB")
             
-            # Prepare update data with timestamp tracking and email
+            current_time = now_dt()
+            # Expressions in a pipeline $set see the document as it was before
+            # the update, so "$status" below is the previous status
+            status_changed = {"$ne": ["$status", new_status]}
             update_data = {
-                "status": new_status,
-                "updated_at": datetime.now().strftime("%H:%M %d-%m-%Y"),
-                "updated_by_email": updated_by_email
+                "status": {"$literal": new_status},
+                "updated_at": {"$literal": current_time},
+                "updated_by_email": {"$literal": updated_by_email}
             }
 
             # Track when status is changed to in_progress
-            if new_status == "in_progress" and previous_status != "in_progress":
-                update_data["in_progress_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
+            if new_status == "in_progress":
+                update_data["in_progress_at"] = {"$cond": [status_changed, current_time, "$in_progress_at"]}
                 # Clear awaiting confirmation flag when work restarts
-                update_data["awaiting_user_confirmation"] = False
+                update_data["awaiting_user_confirmation"] = {"$cond": [status_changed, False, "$awaiting_user_confirmation"]}
 
             # Track when status is changed to completed
-            if new_status == "completed" and previous_status != "completed":
-                update_data["completed_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
+            if new_status == "completed":
+                update_data["completed_at"] = {"$cond": [status_changed, current_time, "$completed_at"]}
                 # Clear awaiting confirmation flag when fully completed
-                update_data["awaiting_user_confirmation"] = False
+                update_data["awaiting_user_confirmation"] = {"$cond": [status_changed, False, "$awaiting_user_confirmation"]}
 
             # Set awaiting_user_confirmation flag when admin marks as completed
-            if new_status == "admin_completed" and previous_status != "admin_completed":
-                update_data["awaiting_user_confirmation"] = True
+            if new_status == "admin_completed":
+                update_data["awaiting_user_confirmation"] = {"$cond": [status_changed, True, "$awaiting_user_confirmation"]}
             
-            # Update the status
+            # Read and update in a single round trip. The document comes back as
+            # it was before the update, and the new state is applied to it below
+            # the same way, so the previous status never has to be stored.
+            # Earlier versions did store it - drop that leftover field too.
             result = await issues_collection.find_one_and_update(
                 {"ticket_id": ticket_id},
-                {"$set": update_data},
-                return_document=True
+                [{"$set": update_data}, {"$unset": "previous_status"}],
+                return_document=ReturnDocument.BEFORE
             )
             
             if result:
                 # Convert ObjectId to string
                 if "_id" in result:
                     result["_id"] = str(result["_id"])
-                result["previous_status"] = previous_status
-                print(f"Database: Successfully updated in MongoDB")
-                return result
+                result.pop("previous_status", None)
+                previous_status = _apply_status_change(result, new_status, updated_by_email, current_time)
+                logger.debug("Database: Successfully updated in MongoDB")
+                await invalidate_issue_caches()
+                return {
+                    **result,
+                    "previous_status": previous_status
+                }
+            
+            logger.debug("Database: No issue found with ticket_id %s", ticket_id)
+            return None
                 
         except Exception as e:
-            print(f"Database: Error updating issue status in MongoDB: {e}")
+            logger.error("Database: Error updating issue status in MongoDB: %s", e)
     
     # Use in-memory storage
-    print("Database: Using in-memory storage")
-    for issue in _in_memory_issues:
-        if issue.get("ticket_id") == ticket_id:
-            previous_status = issue.get("status", "unknown")
-            issue["status"] = new_status
-            issue["updated_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
-            issue["updated_by_email"] = updated_by_email
-
-            # Track when status is changed to in_progress
-            if new_status == "in_progress" and previous_status != "in_progress":
-                issue["in_progress_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
-                # Clear awaiting confirmation flag when work restarts
-                issue["awaiting_user_confirmation"] = False
-
-            # Track when status is changed to completed
-            if new_status == "completed" and previous_status != "completed":
-                issue["completed_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
-                # Clear awaiting confirmation flag when fully completed
-                issue["awaiting_user_confirmation"] = False
-
-            # Set awaiting_user_confirmation flag when admin marks as completed
-            if new_status == "admin_completed" and previous_status != "admin_completed":
-                issue["awaiting_user_confirmation"] = True
+    logger.debug("Database: Using in-memory storage")
+    issue = _in_memory_issues_by_ticket.get(ticket_id)
+    if issue is not None:
+        previous_status = _apply_status_change(issue, new_status, updated_by_email, now_dt())
             
-            print(f"Database: Successfully updated in memory")
-            return {
-                **issue,
-                "previous_status": previous_status
-            }
+        logger.debug("Database: Successfully updated in memory")
+        await invalidate_issue_caches()
+        return {
+            **issue,
+            "previous_status": previous_status
+        }
     
-    print(f"Database: No issue found in memory with ticket_id {ticket_id}")
+    logger.debug("Database: No issue found in memory with ticket_id %s", ticket_id)
     return None
 
+async def issue_exists(ticket_id: str) -> bool:
+    """Check whether an issue with this ticket ID exists, without loading it"""
+    if issues_collection is not None:
+        try:
+            return await issues_collection.find_one({"ticket_id": ticket_id}, {"_id": 1}) is not None
+        except Exception as e:
+            logger.error("Database: Error checking issue in MongoDB: %s", e)
+
+    # Use in-memory storage
+    return ticket_id in _in_memory_issues_by_ticket
+
 async def get_issue_by_ticket_id(ticket_id: str) -> Optional[IssueDB]:
     """Get a single issue by ticket ID"""
-    print(f"Database: Getting issue by ticket_id {ticket_id}")
+    logger.debug("Database: Getting issue by ticket_id %s", ticket_id)
 
     if issues_collection is not None:
         try:
-            print("Database: Using MongoDB")
+            logger.debug("Database: Using MongoDB")
             issue_data = await issues_collection.find_one({"ticket_id": ticket_id})
 
             if issue_data:
@@ -362,134 +626,198 @@ async def get_issue_by_ticket_id(ticket_id: str) -> Optional[IssueDB]:
                     issue_data["id"] = str(issue_data["_id"])
                     del issue_data["_id"]
 
-                print(f"Database: Found issue in MongoDB")
-                return IssueDB(**issue_data)
+                logger.debug("Database: Found issue in MongoDB")
+                return IssueDB.model_validate(issue_data)
             else:
-                print(f"Database: No issue found in MongoDB with ticket_id {ticket_id}")
+                logger.debug("Database: No issue found in MongoDB with ticket_id %s", ticket_id)
 
         except Exception as e:
-            print(f"Database: Error getting issue from MongoDB: {e}")
+            logger.error("Database: Error getting issue from MongoDB: %s", e)
 
     # Use in-memory storage
-    print("Database: Using in-memory storage")
-    for issue in _in_memory_issues:
-        if issue.get("ticket_id") == ticket_id:
-            print(f"Database: Found issue in memory")
-            return IssueDB(**issue)
+    logger.debug("Database: Using in-memory storage")
+    issue = _in_memory_issues_by_ticket.get(ticket_id)
+    if issue is not None:
+        logger.debug("Database: Found issue in memory")
+        return IssueDB.model_validate(issue)
 
-    print(f"Database: No issue found in memory with ticket_id {ticket_id}")
+    logger.debug("Database: No issue found in memory with ticket_id %s", ticket_id)
     return None
 
-async def get_issues_by_user_email(user_email: str) -> list[IssueDB]:
-    """Get all issues created by a specific user email"""
+async def iter_issues_by_user_email(user_email: str) -> AsyncIterator[IssueDB]:
+    """Yield the issues created by a specific user email one at a time, straight off the cursor"""
     if issues_collection is not None:
+        yielded = False
         try:
             # Find issues where the user's email is in the users array
-            cursor = issues_collection.find({"users": user_email})
-            issues = []
-            async for issue in cursor:
+            async for issue in issues_collection.find({"users": user_email}).sort("_id", 1):
                 # Convert ObjectId to string
                 if "_id" in issue:
                     issue["_id"] = str(issue["_id"])
-                issues.append(IssueDB(**issue))
-            return issues
+                yielded = True
+                yield IssueDB.model_validate(issue)
+            return
         except Exception as e:
             print(f"Error querying MongoDB for user issues: {e}")
+            # Part of the result is already out - don't repeat it from memory
+            if yielded:
+                return
     
     # Use in-memory storage
-    user_issues = []
     for issue in _in_memory_issues:
         if "users" in issue and user_email in issue["users"]:
-            user_issues.append(IssueDB(**issue))
-    return user_issues
+            yield IssueDB.model_validate(issue)
+
+async def mark_issue_completion(ticket_id: str, completion_type: str, completed_by_email: str) -> Tuple[str, Optional[dict]]:
+    """
+    Mark issue completion by admin or user.
 
-async def mark_issue_completion(ticket_id: str, completion_type: str, completed_by_email: str) -> Optional[dict]:
-    """Mark issue completion by admin or user"""
-    print(f"Database: Marking {completion_type} completion for ticket {ticket_id} by {completed_by_email}")
+    Returns a (status, issue) pair where status is "ok", "not_found", or
+    "admin_required" when a user tries to complete before the admin has.
+    The issue is only returned with "ok".
+    """
+    logger.debug("Database: Marking %s completion for ticket %s by %s", completion_type, ticket_id, completed_by_email)
     
     if issues_collection is not None:
         try:
             from bson import ObjectId
-            print("Database: Using MongoDB")
-            
-            # Find the issue first
-            issue_data = await issues_collection.find_one({"ticket_id": ticket_id})
-            if not issue_data:
-                print(f"Database: No issue found with ticket_id {ticket_id}")
-                return None
+            logger.debug("Database: Using MongoDB")
             
-            current_time = datetime.now().strftime("%H:%M %d-%m-%Y")
+            current_time = now_dt()
             update_data = {
-                "updated_at": current_time,
-                "updated_by_email": completed_by_email
+                "updated_at": {"$literal": current_time},
+                "updated_by_email": {"$literal": completed_by_email}
             }
             
             # Set completion fields based on type
             if completion_type == "admin":
-                update_data["admin_completed_at"] = current_time
-                update_data["admin_completed_by"] = completed_by_email
+                update_data["admin_completed_at"] = {"$literal": current_time}
+                update_data["admin_completed_by"] = {"$literal": completed_by_email}
                 # Update status to "admin_completed" if not already completed
-                if issue_data.get("status") != "completed":
-                    update_data["status"] = "admin_completed"
+                update_data["status"] = {"$cond": [{"$eq": ["$status", "completed"]}, "$status", "admin_completed"]}
             elif completion_type == "user":
-                update_data["user_completed_at"] = current_time
-                update_data["user_completed_by"] = completed_by_email
+                update_data["user_completed_at"] = {"$literal": current_time}
+                update_data["user_completed_by"] = {"$literal": completed_by_email}
             
-            # Check if both admin and user have completed
-            admin_completed = issue_data.get("admin_completed_at") or update_data.get("admin_completed_at")
-            user_completed = issue_data.get("user_completed_at") or update_data.get("user_completed_at")
+            # Check if both admin and user have completed - evaluated after the
+            # first stage so it sees the timestamps set above
+            both_completed = {"$and": [
+                {"$ifNull": ["$admin_completed_at", False]},
+                {"$ifNull": ["$user_completed_at", False]}
+            ]}
+            completion_check = {
+                "status": {"$cond": [both_completed, "completed", "$status"]},
+                "completed_at": {"$cond": [both_completed, current_time, "$completed_at"]}
+            }
             
-            if admin_completed and user_completed:
-                update_data["status"] = "completed"
-                update_data["completed_at"] = current_time
+            # User completion is only allowed once the admin has completed -
+            # guard it in the update filter instead of a separate read
+            query = {"ticket_id": ticket_id}
+            if completion_type == "user":
+                query["admin_completed_at"] = {"$ne": None}
             
-            # Update the issue
+            # Update the issue in a single round trip
             result = await issues_collection.find_one_and_update(
-                {"ticket_id": ticket_id},
-                {"$set": update_data},
-                return_document=True
+                query,
+                [{"$set": update_data}, {"$set": completion_check}],
+                return_document=ReturnDocument.AFTER
             )
             
             if result:
                 # Convert ObjectId to string
                 if "_id" in result:
                     result["_id"] = str(result["_id"])
-                print(f"Database: Successfully updated completion in MongoDB")
-                return result
+                logger.debug("Database: Successfully updated completion in MongoDB")
+                await invalidate_issue_caches()
+                return "ok", result
+            
+            # Nothing matched - only a guarded user completion needs a second look
+            if completion_type == "user" and await issues_collection.count_documents({"ticket_id": ticket_id}, limit=1):
+                logger.debug("Database: Admin has not completed ticket_id %s yet", ticket_id)
+                return "admin_required", None
+            
+            logger.debug("Database: No issue found with ticket_id %s", ticket_id)
+            return "not_found", None
                 
         except Exception as e:
-            print(f"Database: Error updating completion in MongoDB: {e}")
+            logger.error("Database: Error updating completion in MongoDB: %s", e)
     
     # Use in-memory storage
-    print("Database: Using in-memory storage")
-    for issue in _in_memory_issues:
-        if issue.get("ticket_id") == ticket_id:
-            current_time = datetime.now().strftime("%H:%M %d-%m-%Y")
-            issue["updated_at"] = current_time
-            issue["updated_by_email"] = completed_by_email
+    logger.debug("Database: Using in-memory storage")
+    issue = _in_memory_issues_by_ticket.get(ticket_id)
+    if issue is not None:
+        if completion_type == "user" and not issue.get("admin_completed_at"):
+            logger.debug("Database: Admin has not completed ticket_id %s yet", ticket_id)
+            return "admin_required", None
             
-            # Set completion fields based on type
-            if completion_type == "admin":
-                issue["admin_completed_at"] = current_time
-                issue["admin_completed_by"] = completed_by_email
-                if issue.get("status") != "completed":
-                    issue["status"] = "admin_completed"
-            elif completion_type == "user":
-                issue["user_completed_at"] = current_time
-                issue["user_completed_by"] = completed_by_email
+        current_time = now_dt()
+        issue["updated_at"] = current_time
+        issue["updated_by_email"] = completed_by_email
             
-            # Check if both admin and user have completed
-            admin_completed = issue.get("admin_completed_at")
-            user_completed = issue.get("user_completed_at")
+        # Set completion fields based on type
+        if completion_type == "admin":
+            issue["admin_completed_at"] = current_time
+            issue["admin_completed_by"] = completed_by_email
+            if issue.get("status") != "completed":
+                issue["status"] = "admin_completed"
+        elif completion_type == "user":
+            issue["user_completed_at"] = current_time
+            issue["user_completed_by"] = completed_by_email
             
-            if admin_completed and user_completed:
-                issue["status"] = "completed"
-                issue["completed_at"] = current_time
+        # Check if both admin and user have completed
+        admin_completed = issue.get("admin_completed_at")
+        user_completed = issue.get("user_completed_at")
             
-            print(f"Database: Successfully updated completion in memory")
-            return issue
+        if admin_completed and user_completed:
+            issue["status"] = "completed"
+            issue["completed_at"] = current_time
+            
+        logger.debug("Database: Successfully updated completion in memory")
+        await invalidate_issue_caches()
+        return "ok", issue
     
-    print(f"Database: No issue found in memory with ticket_id {ticket_id}")
+    logger.debug("Database: No issue found in memory with ticket_id %s", ticket_id)
+    return "not_found", None
+
+async def resolve_pending_confirmation(user: str, confirmed: bool) -> Optional[dict]:
+    """
+    Apply a reporter's yes/no reply to their most recently updated issue that is
+    awaiting confirmation: "completed" if confirmed, back to "in_progress" if not.
+    Returns the updated issue, or None if nothing was awaiting confirmation.
+    """
+    new_status = "completed" if confirmed else "in_progress"
+    current_time = now_dt()
+    update_data = {
+        "status": new_status,
+        "awaiting_user_confirmation": False,
+        "updated_at": current_time
+    }
+    if confirmed:
+        update_data["completed_at"] = current_time
+
+    if issues_collection is not None:
+        try:
+            # Find and update in one round trip
+            result = await issues_collection.find_one_and_update(
+                {"users": user, "awaiting_user_confirmation": True},
+                {"$set": update_data},
+                sort=[("updated_at", -1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if result:
+                if "_id" in result:
+                    result["_id"] = str(result["_id"])
+                await invalidate_issue_caches()
+            return result
+        except Exception as e:
+            logger.error("Database: Error resolving confirmation in MongoDB: %s", e)
+
+    # Use in-memory storage - most recently created first
+    for issue in reversed(_in_memory_issues):
+        if user in issue.get("users", []) and issue.get("awaiting_user_confirmation", False):
+            issue.update(update_data)
+            await invalidate_issue_caches()
+            return issue
     return None
 
 # Department management functions
@@ -508,7 +836,26 @@ async def create_department(department_data: dict) -> Department:
         import uuid
         department_data["_id"] = str(uuid.uuid4())
         _in_memory_departments.append(department_data)
-    return Department(**department_data)
+    return Department.model_validate(department_data)
+
+async def create_departments(departments_data: List[dict]) -> List[Department]:
+    """Create several departments with a single insert_many"""
+    if not departments_data:
+        return []
+    if departments_collection is not None:
+        try:
+            result = await departments_collection.insert_many(departments_data, ordered=False)
+            for department_data, inserted_id in zip(departments_data, result.inserted_ids):
+                department_data["_id"] = str(inserted_id)
+            return [Department.model_validate(department_data) for department_data in departments_data]
+        except Exception as e:
+            logger.error("Error inserting departments to MongoDB: %s", e)
+    
+    import uuid
+    for department_data in departments_data:
+        department_data["_id"] = str(uuid.uuid4())
+        _in_memory_departments.append(department_data)
+    return [Department.model_validate(department_data) for department_data in departments_data]
 
 async def get_all_departments() -> List[Department]:
     """Get all active departments"""
@@ -519,12 +866,12 @@ async def get_all_departments() -> List[Department]:
             async for dept in cursor:
                 if "_id" in dept:
                     dept["_id"] = str(dept["_id"])
-                departments.append(Department(**dept))
+                departments.append(Department.model_validate(dept))
             return departments
         except Exception as e:
             print(f"Error querying departments from MongoDB: {e}")
     
-    return [Department(**dept) for dept in _in_memory_departments if dept.get("is_active", True)]
+    return [Department.model_validate(dept) for dept in _in_memory_departments if dept.get("is_active", True)]
 
 async def get_department_by_id(department_id: str) -> Optional[Department]:
     """Get department by ID"""
@@ -535,13 +882,13 @@ async def get_department_by_id(department_id: str) -> Optional[Department]:
             if dept_data:
                 if "_id" in dept_data:
                     dept_data["_id"] = str(dept_data["_id"])
-                return Department(**dept_data)
+                return Department.model_validate(dept_data)
         except Exception as e:
             print(f"Error querying department from MongoDB: {e}")
     
     for dept in _in_memory_departments:
         if dept.get("_id") == department_id:
-            return Department(**dept)
+            return Department.model_validate(dept)
     return None
 
 # Worker management functions
@@ -560,23 +907,29 @@ async def create_worker_profile(worker_data: dict) -> WorkerProfile:
         import uuid
         worker_data["_id"] = str(uuid.uuid4())
         _in_memory_workers.append(worker_data)
-    return WorkerProfile(**worker_data)
+    await invalidate_worker_caches()
+    return WorkerProfile.model_validate(worker_data)
 
-async def get_all_workers() -> List[WorkerProfile]:
-    """Get all active workers"""
+async def iter_all_workers() -> AsyncIterator[WorkerProfile]:
+    """Yield all active workers one at a time, straight off the cursor"""
     if workers_collection is not None:
+        yielded = False
         try:
-            cursor = workers_collection.find({"is_active": True})
-            workers = []
-            async for worker in cursor:
+            async for worker in workers_collection.find({"is_active": True}):
                 if "_id" in worker:
                     worker["_id"] = str(worker["_id"])
-                workers.append(WorkerProfile(**worker))
-            return workers
+                yielded = True
+                yield WorkerProfile.model_validate(worker)
+            return
         except Exception as e:
             print(f"Error querying workers from MongoDB: {e}")
+            # Part of the result is already out - don't repeat it from memory
+            if yielded:
+                return
     
-    return [WorkerProfile(**worker) for worker in _in_memory_workers if worker.get("is_active", True)]
+    for worker in _in_memory_workers:
+        if worker.get("is_active", True):
+            yield WorkerProfile.model_validate(worker)
 
 async def get_workers_by_department(department_id: str) -> List[WorkerProfile]:
     """Get workers by department"""
@@ -587,36 +940,45 @@ async def get_workers_by_department(department_id: str) -> List[WorkerProfile]:
             async for worker in cursor:
                 if "_id" in worker:
                     worker["_id"] = str(worker["_id"])
-                workers.append(WorkerProfile(**worker))
+                workers.append(WorkerProfile.model_validate(worker))
             return workers
         except Exception as e:
             print(f"Error querying workers by department from MongoDB: {e}")
     
-    return [WorkerProfile(**worker) for worker in _in_memory_workers 
+    return [WorkerProfile.model_validate(worker) for worker in _in_memory_workers 
             if worker.get("department_id") == department_id and worker.get("is_active", True)]
 
 async def get_worker_by_email(email: str) -> Optional[WorkerProfile]:
-    """Get worker by email"""
+    """
+    Get worker by email. Profiles rarely change, so MongoDB results are cached
+    until the next worker write clears the workers namespace.
+    """
     if workers_collection is not None:
+        cache_key = f"{WORKERS_CACHE_NAMESPACE}:profile:{email}"
+        cached_worker = await cache_service.get(cache_key)
+        if cached_worker is not None:
+            return WorkerProfile.model_validate(cached_worker)
         try:
             worker_data = await workers_collection.find_one({"email": email})
             if worker_data:
                 if "_id" in worker_data:
                     worker_data["_id"] = str(worker_data["_id"])
-                return WorkerProfile(**worker_data)
+                worker = WorkerProfile.model_validate(worker_data)
+                await cache_service.set(cache_key, worker.model_dump(mode="json", by_alias=True), ttl=300)
+                return worker
         except Exception as e:
             print(f"Error querying worker from MongoDB: {e}")
     
     for worker in _in_memory_workers:
         if worker.get("email") == email:
-            return WorkerProfile(**worker)
+            return WorkerProfile.model_validate(worker)
     return None
 
 async def update_worker_profile(email: str, update_data: dict) -> Optional[WorkerProfile]:
     """Update worker profile"""
     if workers_collection is not None:
         try:
-            update_data["updated_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
+            update_data["updated_at"] = now_dt()
             result = await workers_collection.find_one_and_update(
                 {"email": email},
                 {"$set": update_data},
@@ -625,34 +987,75 @@ async def update_worker_profile(email: str, update_data: dict) -> Optional[Worke
             if result:
                 if "_id" in result:
                     result["_id"] = str(result["_id"])
-                return WorkerProfile(**result)
+                await invalidate_worker_caches()
+                return WorkerProfile.model_validate(result)
         except Exception as e:
             print(f"Error updating worker in MongoDB: {e}")
     
     for worker in _in_memory_workers:
         if worker.get("email") == email:
             worker.update(update_data)
-            worker["updated_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
-            return WorkerProfile(**worker)
+            worker["updated_at"] = now_dt()
+            await invalidate_worker_caches()
+            return WorkerProfile.model_validate(worker)
+    return None
+
+async def increment_worker_workload(email: str, amount: int = 1) -> Optional[WorkerProfile]:
+    """Atomically adjust a worker's current_workload. Returns None if there is no such worker"""
+    if workers_collection is not None:
+        try:
+            result = await workers_collection.find_one_and_update(
+                {"email": email},
+                {"$inc": {"current_workload": amount}, "$set": {"updated_at": now_dt()}},
+                return_document=ReturnDocument.AFTER
+            )
+            if result:
+                if "_id" in result:
+                    result["_id"] = str(result["_id"])
+                await invalidate_worker_caches()
+                return WorkerProfile.model_validate(result)
+            return None
+        except Exception as e:
+            logger.error("Error updating worker workload in MongoDB: %s", e)
+    
+    for worker in _in_memory_workers:
+        if worker.get("email") == email:
+            worker["current_workload"] = worker.get("current_workload", 0) + amount
+            worker["updated_at"] = now_dt()
+            await invalidate_worker_caches()
+            return WorkerProfile.model_validate(worker)
     return None
 
 # Issue assignment functions
-async def create_issue_assignment(assignment_data: dict) -> IssueAssignment:
-    """Create a new issue assignment"""
+async def create_issue_assignment(assignment_data: dict) -> Optional[IssueAssignment]:
+    """
+    Create a new issue assignment.
+
+    Returns None if the ticket is already assigned - the unique ticket_id
+    index rejects the insert. If that index couldn't be created at startup,
+    the ticket is looked up first instead.
+    """
     if assignments_collection is not None:
+        if ("assignments", "ticket_id") not in _unique_indexes_ready:
+            if await get_assignment_by_ticket(assignment_data["ticket_id"]):
+                return None
         try:
             result = await assignments_collection.insert_one(assignment_data)
             assignment_data["_id"] = str(result.inserted_id)
+        except DuplicateKeyError:
+            return None
         except Exception as e:
             print(f"Error inserting assignment to MongoDB: {e}")
             import uuid
             assignment_data["_id"] = str(uuid.uuid4())
             _in_memory_assignments.append(assignment_data)
     else:
+        if any(a.get("ticket_id") == assignment_data["ticket_id"] for a in _in_memory_assignments):
+            return None
         import uuid
         assignment_data["_id"] = str(uuid.uuid4())
         _in_memory_assignments.append(assignment_data)
-    return IssueAssignment(**assignment_data)
+    return IssueAssignment.model_validate(assignment_data)
 
 async def get_assignments_by_worker(worker_email: str) -> List[IssueAssignment]:
     """Get all assignments for a worker"""
@@ -663,12 +1066,12 @@ async def get_assignments_by_worker(worker_email: str) -> List[IssueAssignment]:
             async for assignment in cursor:
                 if "_id" in assignment:
                     assignment["_id"] = str(assignment["_id"])
-                assignments.append(IssueAssignment(**assignment))
+                assignments.append(IssueAssignment.model_validate(assignment))
             return assignments
         except Exception as e:
             print(f"Error querying assignments from MongoDB: {e}")
     
-    return [IssueAssignment(**assignment) for assignment in _in_memory_assignments 
+    return [IssueAssignment.model_validate(assignment) for assignment in _in_memory_assignments 
             if assignment.get("assigned_to") == worker_email]
 
 async def get_assignment_by_ticket(ticket_id: str) -> Optional[IssueAssignment]:
@@ -679,30 +1082,126 @@ async def get_assignment_by_ticket(ticket_id: str) -> Optional[IssueAssignment]:
             if assignment_data:
                 if "_id" in assignment_data:
                     assignment_data["_id"] = str(assignment_data["_id"])
-                return IssueAssignment(**assignment_data)
+                return IssueAssignment.model_validate(assignment_data)
         except Exception as e:
             print(f"Error querying assignment from MongoDB: {e}")
     
     for assignment in _in_memory_assignments:
         if assignment.get("ticket_id") == ticket_id:
-            return IssueAssignment(**assignment)
+            return IssueAssignment.model_validate(assignment)
     return None
 
-async def get_all_assignments() -> List[IssueAssignment]:
-    """Get all assignments from the database"""
+async def iter_all_assignments() -> AsyncIterator[IssueAssignment]:
+    """Yield all assignments one at a time, straight off the cursor"""
     if assignments_collection is not None:
+        yielded = False
         try:
-            cursor = assignments_collection.find()
-            assignments = []
-            async for assignment in cursor:
+            async for assignment in assignments_collection.find():
                 if "_id" in assignment:
                     assignment["_id"] = str(assignment["_id"])
-                assignments.append(IssueAssignment(**assignment))
-            return assignments
+                yielded = True
+                yield IssueAssignment.model_validate(assignment)
+            return
         except Exception as e:
             print(f"Error querying all assignments from MongoDB: {e}")
+            # Part of the result is already out - don't repeat it from memory
+            if yielded:
+                return
     
-    return [IssueAssignment(**assignment) for assignment in _in_memory_assignments]
+    for assignment in _in_memory_assignments:
+        yield IssueAssignment.model_validate(assignment)
+
+async def set_issue_assigned(ticket_id: str, assigned: bool = True) -> None:
+    """Keep the denormalized assigned flag on an issue in sync with its assignment"""
+    if issues_collection is not None:
+        try:
+            await issues_collection.update_one({"ticket_id": ticket_id}, {"$set": {"assigned": assigned}})
+            await invalidate_issue_caches()
+            return
+        except Exception as e:
+            logger.error("Error updating assigned flag in MongoDB: %s", e)
+    
+    issue = _in_memory_issues_by_ticket.get(ticket_id)
+    if issue is not None:
+        issue["assigned"] = assigned
+        await invalidate_issue_caches()
+
+async def backfill_issue_assigned_flags():
+    """Set the assigned flag on issues stored before it existed. A no-op once every issue has it"""
+    if issues_collection is None or assignments_collection is None:
+        return
+    
+    try:
+        if not await issues_collection.count_documents({"assigned": {"$exists": False}}, limit=1):
+            return
+        assigned_tickets = await assignments_collection.distinct("ticket_id")
+        await issues_collection.update_many(
+            {"assigned": {"$exists": False}, "ticket_id": {"$in": assigned_tickets}},
+            {"$set": {"assigned": True}}
+        )
+        await issues_collection.update_many({"assigned": {"$exists": False}}, {"$set": {"assigned": False}})
+        logger.info("Database: Backfilled issue assigned flags")
+    except Exception as e:
+        logger.error("Database: Error backfilling issue assigned flags: %s", e)
+
+# Marker recorded in the migrations collection once stored hashes use xxh3
+CONTENT_HASH_MIGRATION = "content_hash_xxh3_128"
+
+async def backfill_issue_content_hashes():
+    """Recompute content hashes stored as md5 digests so exact dedup keeps matching
+    issues created before the switch to xxh3. Runs once, then records a marker"""
+    if issues_collection is None or migrations_collection is None:
+        return
+    
+    try:
+        if await migrations_collection.find_one({"_id": CONTENT_HASH_MIGRATION}):
+            return
+        updates = []
+        rehashed = 0
+        projection = {"original_text": 1, "location": 1, "content_hash": 1}
+        async for issue in issues_collection.find({}, projection):
+            if not issue.get("original_text"):
+                continue
+            content_hash = await create_content_hash(issue["original_text"], issue.get("location"))
+            if content_hash != issue.get("content_hash"):
+                updates.append(UpdateOne({"_id": issue["_id"]}, {"$set": {"content_hash": content_hash}}))
+            if len(updates) >= 1000:
+                await issues_collection.bulk_write(updates, ordered=False)
+                rehashed += len(updates)
+                updates = []
+        if updates:
+            await issues_collection.bulk_write(updates, ordered=False)
+            rehashed += len(updates)
+        await migrations_collection.update_one(
+            {"_id": CONTENT_HASH_MIGRATION},
+            {"$set": {"completed_at": now_dt()}},
+            upsert=True
+        )
+        logger.info("Database: Backfilled content hashes on %s issues", rehashed)
+    except Exception as e:
+        logger.error("Database: Error backfilling issue content hashes: %s", e)
+
+async def iter_unassigned_issues() -> AsyncIterator[IssueDB]:
+    """Yield issues that have no assignment yet, one at a time"""
+    if issues_collection is not None:
+        yielded = False
+        try:
+            async for issue in issues_collection.find({"assigned": False}).sort("_id", 1):
+                if "_id" in issue:
+                    issue["_id"] = str(issue["_id"])
+                yielded = True
+                yield IssueDB.model_validate(issue)
+            return
+        except Exception as e:
+            logger.error("Error querying unassigned issues from MongoDB: %s", e)
+            # Part of the result is already out - don't repeat it from memory
+            if yielded:
+                return
+    
+    # Use in-memory storage
+    for issue in _in_memory_issues:
+        if not issue.get("assigned"):
+            yield IssueDB.model_validate(issue)
 
 async def reassign_issue_assignment(assignment_id: str, new_worker_email: str) -> Optional[IssueAssignment]:
     """Reassign an issue to a different worker"""
@@ -714,7 +1213,7 @@ async def reassign_issue_assignment(assignment_id: str, new_worker_email: str) -
                 {
                     "$set": {
                         "assigned_to": new_worker_email,
-                        "updated_at": datetime.now().strftime("%H:%M %d-%m-%Y")
+                        "updated_at": now_dt()
                     }
                 },
                 return_document=True
@@ -722,15 +1221,15 @@ async def reassign_issue_assignment(assignment_id: str, new_worker_email: str) -
             if result:
                 if "_id" in result:
                     result["_id"] = str(result["_id"])
-                return IssueAssignment(**result)
+                return IssueAssignment.model_validate(result)
         except Exception as e:
             print(f"Error reassigning in MongoDB: {e}")
     
     for assignment in _in_memory_assignments:
         if assignment.get("_id") == assignment_id:
             assignment["assigned_to"] = new_worker_email
-            assignment["updated_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
-            return IssueAssignment(**assignment)
+            assignment["updated_at"] = now_dt()
+            return IssueAssignment.model_validate(assignment)
     return None
 
 async def get_worker_workload(worker_email: str) -> int:
@@ -760,7 +1259,7 @@ async def update_assignment_status(ticket_id: str, status: str, notes: Optional[
             if notes:
                 update_data["notes"] = notes
             if status == "completed":
-                update_data["completed_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
+                update_data["completed_at"] = now_dt()
             
             result = await assignments_collection.find_one_and_update(
                 {"ticket_id": ticket_id},
@@ -770,7 +1269,7 @@ async def update_assignment_status(ticket_id: str, status: str, notes: Optional[
             if result:
                 if "_id" in result:
                     result["_id"] = str(result["_id"])
-                return IssueAssignment(**result)
+                return IssueAssignment.model_validate(result)
         except Exception as e:
             print(f"Error updating assignment in MongoDB: {e}")
     
@@ -780,8 +1279,8 @@ async def update_assignment_status(ticket_id: str, status: str, notes: Optional[
             if notes:
                 assignment["notes"] = notes
             if status == "completed":
-                assignment["completed_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
-            return IssueAssignment(**assignment)
+                assignment["completed_at"] = now_dt()
+            return IssueAssignment.model_validate(assignment)
     return None
 
 # User management functions
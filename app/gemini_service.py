@@ -1,9 +1,12 @@
 import os
 import json
+import asyncio
 import re
 import google.generativeai as genai
+import xxhash
 from typing import Dict, Any
 from dotenv import load_dotenv, find_dotenv
+from .cache_service import cache_service
 
 load_dotenv(find_dotenv(), override=True)
 
@@ -25,6 +28,40 @@ if GEMINI_API_KEY:
 else:
     model = None
 
+# Keyword tables for rule-based categorization, built once at import time
+_SANITATION = frozenset({"garbage", "कचरा", "waste", "trash", "sanitation", "सफाई", "clean", "dustbin", "डस्टबिन"})
+_WATER = frozenset({"water", "पानी", "supply", "tap", "drainage", "नाली", "sewer", "सीवर", "flood", "बाढ़"})
+_ELECTRICITY = frozenset({"electricity", "बिजली", "power", "light", "streetlight", "स्ट्रीटलाइट", "bulb", "बल्ब", "wire", "तार"})
+_ROADS = frozenset({"गड्ढा", "pothole", "road", "street", "गली", "सड़क", "transport", "यातायात", "traffic", "signal", "bus", "बस"})
+_HEALTH = frozenset({"health", "स्वास्थ्य", "safety", "सुरक्षा", "hospital", "अस्पताल", "clinic", "क्लिनिक", "medical", "चिकित्सा"})
+_ENVIRONMENT = frozenset({"park", "पार्क", "garden", "बगीचा", "tree", "पेड़", "environment", "पर्यावरण", "pollution", "प्रदूषण"})
+_BUILDING = frozenset({"building", "भवन", "infrastructure", "बुनियादी ढांचा", "construction", "निर्माण", "bridge", "पुल", "wall", "दीवार"})
+_TAXES = frozenset({"tax", "कर", "document", "दस्तावेज", "certificate", "प्रमाणपत्र", "license", "लाइसेंस", "permit", "अनुमति"})
+_EMERGENCY = frozenset({"emergency", "आपातकाल", "fire", "आग", "police", "पुलिस", "ambulance", "एम्बुलेंस", "rescue", "बचाव"})
+_ANIMAL = frozenset({"animal", "जानवर", "dog", "कुत्ता", "stray", "आवारा", "pet", "पालतू", "veterinary", "पशु चिकित्सा"})
+
+# Checked in order - earlier categories take priority, as in the original if/elif chain
+_CATEGORY_TABLE = (
+    ("Sanitation & Waste", _SANITATION),
+    ("Water & Drainage", _WATER),
+    ("Electricity & Streetlights", _ELECTRICITY),
+    ("Roads & Transport", _ROADS),
+    ("Public Health & Safety", _HEALTH),
+    ("Environment & Parks", _ENVIRONMENT),
+    ("Building & Infrastructure", _BUILDING),
+    ("Taxes & Documentation", _TAXES),
+    ("Emergency Services", _EMERGENCY),
+    ("Animal Care & Control", _ANIMAL),
+)
+
+# Gemini results are cached per normalized text - the same key as an issue's
+# content hash without a location - so repeated messages skip the API calls
+GEMINI_CACHE_NAMESPACE = "gemini"
+GEMINI_CACHE_TTL = 7 * 24 * 60 * 60
+
+def _analysis_cache_key(text: str) -> str:
+    return f"{GEMINI_CACHE_NAMESPACE}:{xxhash.xxh3_128_hexdigest(text.lower().strip().encode())}"
+
 async def analyze_text(text: str) -> Dict[str, Any]:
     """
     Analyze text using Gemini AI to extract:
@@ -38,6 +75,12 @@ async def analyze_text(text: str) -> Dict[str, Any]:
         # Fallback to rule-based approach if Gemini is not available
         return await fallback_analyze_text(text)
     
+    cache_key = _analysis_cache_key(text)
+    cached_result = await cache_service.get(cache_key)
+    if cached_result is not None:
+        cached_result["original_text"] = text
+        return cached_result
+    
     try:
         # Prompt for address extraction
         address_prompt = f"Extract the address or location from this municipal issue text: {text}. Output only the address/location, nothing else, no formatting."
@@ -48,16 +91,15 @@ async def analyze_text(text: str) -> Dict[str, Any]:
         # Prompt for description generation
         description_prompt = f"Write a basic 2-line description for this municipal issue: {text}. Do not write anything else, just the 2 lines of description without any formatting."
         
-        # Generate address using Gemini
-        address_response = model.generate_content(address_prompt)
+        # Generate address, title and description using Gemini - the three
+        # prompts are independent, so they are sent concurrently
+        address_response, title_response, description_response = await asyncio.gather(
+            model.generate_content_async(address_prompt),
+            model.generate_content_async(title_prompt),
+            model.generate_content_async(description_prompt)
+        )
         address = address_response.text.strip()
-        
-        # Generate title using Gemini
-        title_response = model.generate_content(title_prompt)
         title = title_response.text.strip()
-        
-        # Generate description using Gemini
-        description_response = model.generate_content(description_prompt)
         description = description_response.text.strip()
         
         # Use fallback for category (keeping the existing logic for now)
@@ -69,6 +111,8 @@ async def analyze_text(text: str) -> Dict[str, Any]:
         fallback_result["description"] = description
         fallback_result["original_text"] = text
         
+        # Only Gemini output is cached - rule-based fallbacks are cheap to redo
+        await cache_service.set(cache_key, fallback_result, ttl=GEMINI_CACHE_TTL)
         return fallback_result
         
     except Exception as e:
@@ -82,48 +126,12 @@ async def fallback_analyze_text(text: str) -> Dict[str, Any]:
     """
     text_lower = text.lower()
     
-    # Determine category based on keywords
+    # Determine category based on keywords (first matching table wins)
     category = "Other"
-    
-    # Sanitation & Waste
-    if any(word in text_lower for word in ["garbage", "कचरा", "waste", "trash", "sanitation", "सफाई", "clean", "dustbin", "डस्टबिन"]):
-        category = "Sanitation & Waste"
-    
-    # Water & Drainage
-    elif any(word in text_lower for word in ["water", "पानी", "supply", "tap", "drainage", "नाली", "sewer", "सीवर", "flood", "बाढ़"]):
-        category = "Water & Drainage"
-    
-    # Electricity & Streetlights
-    elif any(word in text_lower for word in ["electricity", "बिजली", "power", "light", "streetlight", "स्ट्रीटलाइट", "bulb", "बल्ब", "wire", "तार"]):
-        category = "Electricity & Streetlights"
-    
-    # Roads & Transport
-    elif any(word in text_lower for word in ["गड्ढा", "pothole", "road", "street", "गली", "सड़क", "transport", "यातायात", "traffic", "signal", "bus", "बस"]):
-        category = "Roads & Transport"
-    
-    # Public Health & Safety
-    elif any(word in text_lower for word in ["health", "स्वास्थ्य", "safety", "सुरक्षा", "hospital", "अस्पताल", "clinic", "क्लिनिक", "medical", "चिकित्सा"]):
-        category = "Public Health & Safety"
-    
-    # Environment & Parks
-    elif any(word in text_lower for word in ["park", "पार्क", "garden", "बगीचा", "tree", "पेड़", "environment", "पर्यावरण", "pollution", "प्रदूषण"]):
-        category = "Environment & Parks"
-    
-    # Building & Infrastructure
-    elif any(word in text_lower for word in ["building", "भवन", "infrastructure", "बुनियादी ढांचा", "construction", "निर्माण", "bridge", "पुल", "wall", "दीवार"]):
-        category = "Building & Infrastructure"
-    
-    # Taxes & Documentation
-    elif any(word in text_lower for word in ["tax", "कर", "document", "दस्तावेज", "certificate", "प्रमाणपत्र", "license", "लाइसेंस", "permit", "अनुमति"]):
-        category = "Taxes & Documentation"
-    
-    # Emergency Services
-    elif any(word in text_lower for word in ["emergency", "आपातकाल", "fire", "आग", "police", "पुलिस", "ambulance", "एम्बुलेंस", "rescue", "बचाव"]):
-        category = "Emergency Services"
-    
-    # Animal Care & Control
-    elif any(word in text_lower for word in ["animal", "जानवर", "dog", "कुत्ता", "stray", "आवारा", "pet", "पालतू", "veterinary", "पशु चिकित्सा"]):
-        category = "Animal Care & Control"
+    for category_name, keywords in _CATEGORY_TABLE:
+        if any(word in text_lower for word in keywords):
+            category = category_name
+            break
     
     # Extract address
     address = extract_address(text, text_lower)
@@ -209,7 +217,7 @@ async def translate_to_hindi(text: str) -> str:
 
         Text to translate: {text}"""
 
-        response = model.generate_content(prompt)
+        response = await model.generate_content_async(prompt)
         hindi_text = response.text.strip()
 
         # Remove any quotes or extra formatting
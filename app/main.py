@@ -1,59 +1,172 @@
-from fastapi import FastAPI, HTTPException, Form, Request
+from fastapi import FastAPI, HTTPException, Form, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
-import uuid
+from fastapi.responses import Response, ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from fastapi.exceptions import RequestValidationError
+from starlette.exceptions import HTTPException as StarletteHTTPException
+import os
+import asyncio
+import hashlib
 import re
-from datetime import datetime
-from typing import List, Set
+from typing import Any, Callable, List, Set, AsyncIterator
 import logging
-from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
+from collections import OrderedDict
 import time
-
+from cachetools import TTLCache
+import orjson
+from pydantic import BaseModel
+
+# LOG_LEVEL=INFO (the default) skips formatting of the debug traces on hot paths.
+# Records go through a queue and a listener thread does the stream writes, so
+# logging never blocks the event loop on stdout.
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(), respect_handler_level=True)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), handlers=[QueueHandler(_log_queue)])
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
-# Message deduplication cache - stores recently processed message IDs
-# Using deque for automatic size limiting and efficient operations
-_processed_message_cache: deque = deque(maxlen=1000)  # Keep last 1000 message IDs
-_processed_message_timestamps: dict = {}  # Track when messages were processed
+# Message deduplication - recently processed webhook message IDs. With Redis they
+# are shared by every worker and expire after a day; otherwise they live in this
+# process as message ID -> when it was processed, oldest first, last 1000 kept
+_PROCESSED_MESSAGES_NAMESPACE = "telerivet:msg"
+_PROCESSED_MESSAGES_TTL = 86400
+_PROCESSED_MESSAGES_MAX = 1000
+_processed_messages: "OrderedDict[str, float]" = OrderedDict()
+
+# Static response for /issues/categories, built once at import time
+_CATEGORIES_RESPONSE = {
+    "categories": (
+        "Sanitation & Waste",
+        "Water & Drainage",
+        "Electricity & Streetlights",
+        "Roads & Transport",
+        "Public Health & Safety",
+        "Environment & Parks",
+        "Building & Infrastructure",
+        "Taxes & Documentation",
+        "Emergency Services",
+        "Animal Care & Control",
+        "Other"
+    )
+}
+# The categories never change at runtime, so the body and its ETag are fixed too
+_CATEGORIES_BODY = orjson.dumps(_CATEGORIES_RESPONSE)
+_CATEGORIES_HEADERS = {
+    "ETag": f'"{hashlib.sha1(_CATEGORIES_BODY).hexdigest()}"',
+    "Cache-Control": "public, max-age=86400, immutable"
+}
+
+# Status changes that notify reporters by SMS, and the accepted completion types
+_SMS_NOTIFY_STATUSES: frozenset = frozenset({"in_progress", "completed", "admin_completed"})
+_COMPLETION_TYPES: frozenset = frozenset({"admin", "user"})
+
+# A reporter identifier is a phone number if it starts with "+" or is at least
+# 10 digits once spaces and dashes are ignored
+_PHONE_RE = re.compile(r"^(?:\+|[ -]*(?:\d[ -]*){10,}\Z)")
+
+# Telerivet webhook filters - events and statuses we DON'T want to process
+# (outgoing messages, status updates, etc.)
+BLACKLISTED_EVENTS: frozenset = frozenset({
+    'send_status',      # When bot sends a message
+    'delivery_status',  # Delivery confirmation
+    'sent',            # Message sent event
+    'delivered',       # Message delivered event
+    'failed',          # Send failed event
+    'message_sent',    # Alternative sent event
+})
+OUTGOING_DIRECTIONS: frozenset = frozenset({'outgoing', 'sent', 'sending'})
+BLACKLISTED_STATUSES: frozenset = frozenset({'sent', 'sending', 'queued', 'failed', 'delivered'})
+
+# Accepted replies to the "is the issue resolved?" confirmation SMS
+YES_RESPONSES: frozenset = frozenset({"yes", "y", "हाँ", "ha", "haa", "han", "हा"})
+NO_RESPONSES: frozenset = frozenset({"no", "n", "नहीं", "nahi", "nahin", "nhi", "नही"})
+
+# "status: <ticket_id>" SMS queries; surrounding whitespace is matched, not captured
+_STATUS_QUERY_RE = re.compile(r"^\s*status\s*:\s*(.+?)\s*$", re.IGNORECASE)
+
+# Short-lived cache of /auth/profile responses keyed by email - profiles rarely change
+_PROFILE_CACHE: TTLCache = TTLCache(maxsize=512, ttl=60)
 
 from .models import (
     IssueRequest, IssueResponse, IssueDB, StatusUpdateRequest, UserEmailRequest, 
     CompletionRequest, CompletionResponse, UserRegistration, UserLogin, UserResponse,
     AssignmentRequest, AssignmentResponse, Department, WorkerProfile, IssueAssignment,  
-    UserRole
+    UserRole, warm_up_models
 )
 from .database import (
     create_content_hash,
     find_existing_issue,
     create_new_issue,
     update_existing_issue,
-    get_all_issues,
+    iter_unassigned_issues,
+    set_issue_assigned,
+    backfill_issue_assigned_flags,
+    backfill_issue_content_hashes,
+    get_filtered_issues,
+    count_filtered_issues,
     update_issue_status_in_db,
-    get_issues_by_user_email,
+    iter_issues_by_user_email,
     get_issue_by_ticket_id,
+    issue_exists,
     mark_issue_completion,
-    issues_collection,
-    _in_memory_issues,
+    resolve_pending_confirmation,
+    ensure_indexes,
+    warm_up_connection_pool,
+    ISSUES_CACHE_NAMESPACE,
+    WORKERS_CACHE_NAMESPACE,
     # New database functions
     get_all_departments,
     get_workers_by_department,
-    get_all_workers,
+    iter_all_workers,
+    iter_all_assignments,
     get_worker_by_email,
+    increment_worker_workload,
     create_issue_assignment,
     get_assignments_by_worker,
-    get_assignment_by_ticket,
     update_assignment_status
 )
 from .gemini_service import analyze_text
 from .auth_service import auth_service
 from .telerivet_service import telerivet_service
+from .cache_service import cache_service
+from .utils import now_fmt, now_dt, format_timestamp, new_ticket_id
 
 app = FastAPI(
     title="Municipal Voice Assistant API",
     description="API for processing municipal issues from voice input",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+class _ErrorHandlingRoute(APIRoute):
+    """
+    Turn any unexpected exception raised by an endpoint into a logged 500 JSON
+    response, so endpoints don't each need a try/except Exception wrapper.
+    This runs inside the middleware stack, so the 500 still gets CORS headers
+    (an app-level Exception handler would be answered outside CORSMiddleware).
+    """
+
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+
+        async def handle(request: Request) -> Response:
+            try:
+                return await route_handler(request)
+            except (StarletteHTTPException, RequestValidationError):
+                raise
+            except Exception as e:
+                logger.exception("Unhandled error in %s %s: %s", request.method, request.url.path, e)
+                return ORJSONResponse(status_code=500, content={"detail": f"Internal server error: {str(e)}"})
+
+        return handle
+
+# Must be set before any route is declared
+app.router.route_class = _ErrorHandlingRoute
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -63,6 +176,76 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _etag_response(request: Request, payload) -> Response:
+    """
+    Serialize payload once and tag it with a content hash. Polling clients that
+    send the same ETag back in If-None-Match get an empty 304 instead of the body.
+    """
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=10"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def _stream_json_array(items: AsyncIterator[Any], encode: Callable[[Any], Any]) -> AsyncIterator[bytes]:
+    """Encode items as a JSON array one element at a time, for StreamingResponse"""
+    yield b"["
+    first = True
+    async for item in items:
+        if not first:
+            yield b","
+        yield orjson.dumps(encode(item))
+        first = False
+    yield b"]"
+
+# IssueResponse is a subset of IssueDB's fields, so list endpoints can dump the
+# stored issue directly instead of building an IssueResponse per item first
+_ISSUE_RESPONSE_FIELDS = frozenset(IssueResponse.model_fields)
+
+def _dump_issue(issue: IssueDB) -> dict:
+    """Dump a stored issue in the IssueResponse shape"""
+    return issue.model_dump(mode="json", include=_ISSUE_RESPONSE_FIELDS)
+
+def _stream_issues(issues: AsyncIterator[IssueDB]) -> AsyncIterator[bytes]:
+    """Stream issues in the IssueResponse shape"""
+    return _stream_json_array(issues, _dump_issue)
+
+def _dump_model(model: BaseModel) -> dict:
+    """Dump a model the way FastAPI serializes a response_model (by alias)"""
+    return model.model_dump(mode="json", by_alias=True)
+
+def _models_response(models: List[BaseModel]) -> ORJSONResponse:
+    """
+    Return already-validated models directly, so FastAPI skips its second
+    response_model validation pass over the list
+    """
+    return ORJSONResponse([_dump_model(model) for model in models])
+
+def _stream_models(models: AsyncIterator[BaseModel]) -> AsyncIterator[bytes]:
+    """Stream models the way FastAPI serializes a response_model"""
+    return _stream_json_array(models, _dump_model)
+
+async def _cached_department_workers(request: Request, department_id: str) -> Response:
+    """Department worker list, served from the response cache when possible"""
+    cache_key = f"{WORKERS_CACHE_NAMESPACE}:department:{department_id}"
+    cached_workers = await cache_service.get(cache_key)
+    if cached_workers is not None:
+        return _etag_response(request, cached_workers)
+    
+    workers = await get_workers_by_department(department_id)
+    worker_payload = [_dump_model(worker) for worker in workers]
+    await cache_service.set(cache_key, worker_payload, ttl=30)
+    return _etag_response(request, worker_payload)
+
+def _serialize_issues(issues: List[IssueDB]) -> List[dict]:
+    """
+    Serialize issues for list endpoints. These return an ORJSONResponse directly,
+    so FastAPI skips a second response_model validation pass over the whole list.
+    """
+    return [_dump_issue(issue) for issue in issues]
+
 @app.get("/")
 async def root():
     return {"message": "Municipal Voice Assistant API is running!"}
@@ -72,21 +255,23 @@ async def submit_issue(issue_request: IssueRequest):
     """
     Submit a new municipal issue or update existing one if duplicate
     """
-    try:
-        # Create content hash for duplicate detection
-        location_dict = None
-        if issue_request.location:
-            location_dict = {
-                "longitude": issue_request.location.longitude,
-                "latitude": issue_request.location.latitude
-            }
+    # Create content hash for duplicate detection
+    location_dict = None
+    if issue_request.location:
+        location_dict = {
+            "longitude": issue_request.location.longitude,
+            "latitude": issue_request.location.latitude
+        }
         
-        content_hash = await create_content_hash(issue_request.text, location_dict)
+    content_hash = await create_content_hash(issue_request.text, location_dict)
         
-        # Analyze text using Gemini API first
+    # An exact resubmission is found by its (indexed) content hash alone -
+    # only pay for the Gemini analysis when that misses
+    existing_issue = await find_existing_issue(content_hash)
+    if not existing_issue:
         analysis_result = await analyze_text(issue_request.text)
-        
-        # Check if issue already exists
+            
+        # Check for a similar issue in the same category
         existing_issue = await find_existing_issue(
             content_hash, 
             issue_request.text, 
@@ -95,105 +280,58 @@ async def submit_issue(issue_request: IssueRequest):
             issue_request.email
         )
         
-        if existing_issue:
-            # Update existing issue
-            updated_issue = await update_existing_issue(
-                existing_issue.id, 
-                issue_request.email
-            )
+    if existing_issue:
+        # Update existing issue
+        updated_issue = await update_existing_issue(
+            existing_issue.id, 
+            issue_request.email
+        )
             
-            return IssueResponse(
-                ticket_id=updated_issue.ticket_id,
-                category=updated_issue.category,
-                address=updated_issue.address,
-                location=updated_issue.location,
-                description=updated_issue.description,
-                title=updated_issue.title,
-                photo=updated_issue.photo,
-                status=updated_issue.status,
-                created_at=updated_issue.created_at,
-                users=updated_issue.users,
-                issue_count=updated_issue.issue_count,
-                original_text=updated_issue.original_text,
-                in_progress_at=updated_issue.in_progress_at,
-                completed_at=updated_issue.completed_at,
-                updated_by_email=getattr(updated_issue, 'updated_by_email', None),
-                updated_at=getattr(updated_issue, 'updated_at', None),
-                admin_completed_at=getattr(updated_issue, 'admin_completed_at', None),
-                user_completed_at=getattr(updated_issue, 'user_completed_at', None),
-                admin_completed_by=getattr(updated_issue, 'admin_completed_by', None),
-                user_completed_by=getattr(updated_issue, 'user_completed_by', None)
-            )
-        
-        # Analyze text using Gemini API
-        analysis_result = await analyze_text(issue_request.text)
-        
-        # Generate unique ticket ID
-        ticket_id = f"TKT-{datetime.now().strftime('%d%m%Y')}-{str(uuid.uuid4())[:8].upper()}"
-        
-        # Format current date and time
-        current_datetime = datetime.now().strftime("%H:%M %d-%m-%Y")
-        
-        # Create new issue data
-        new_issue_data = {
-            "ticket_id": ticket_id,
-            "category": analysis_result["category"],
-            "address": analysis_result["address"],
-            "location": location_dict,
-            "description": analysis_result["description"],
-            "title": analysis_result["title"],
-            "photo": issue_request.photo,
-            "status": "new",
-            "created_at": current_datetime,
-            "users": [issue_request.email],
-            "issue_count": 1,
-            "content_hash": content_hash,
-            "original_text": issue_request.text,  # Store original user input
-            "in_progress_at": None,  # Initialize timestamp fields
-            "completed_at": None,
-            "updated_by_email": issue_request.email,  # Set initial updater as the creator
-            "updated_at": current_datetime,  # Set initial update time as creation time
-            "admin_completed_at": None,  # Initialize completion fields
-            "user_completed_at": None,
-            "admin_completed_by": None,
-            "user_completed_by": None
-        }
+        return IssueResponse.from_db(updated_issue)
+
+    now = now_dt()
+        
+    # Generate unique ticket ID
+    ticket_id = new_ticket_id()
+        
+    # Create new issue data
+    new_issue_data = {
+        "ticket_id": ticket_id,
+        "category": analysis_result["category"],
+        "address": analysis_result["address"],
+        "location": location_dict,
+        "description": analysis_result["description"],
+        "title": analysis_result["title"],
+        "photo": issue_request.photo,
+        "status": "new",
+        "created_at": now,
+        "users": [issue_request.email],
+        "issue_count": 1,
+        "content_hash": content_hash,
+        "original_text": issue_request.text,  # Store original user input
+        "in_progress_at": None,  # Initialize timestamp fields
+        "completed_at": None,
+        "updated_by_email": issue_request.email,  # Set initial updater as the creator
+        "updated_at": now,  # Set initial update time as creation time
+        "admin_completed_at": None,  # Initialize completion fields
+        "user_completed_at": None,
+        "admin_completed_by": None,
+        "user_completed_by": None
+    }
         
-        # Save to database
-        created_issue = await create_new_issue(new_issue_data)
+    # Save to database
+    created_issue = await create_new_issue(new_issue_data)
 
-        return IssueResponse(
-            ticket_id=created_issue.ticket_id,
-            category=created_issue.category,
-            address=created_issue.address,
-            location=created_issue.location,
-            description=created_issue.description,
-            title=created_issue.title,
-            photo=created_issue.photo,
-            status=created_issue.status,
-            created_at=created_issue.created_at,
-            users=created_issue.users,
-            issue_count=created_issue.issue_count,
-            original_text=created_issue.original_text,
-            in_progress_at=created_issue.in_progress_at,
-            completed_at=created_issue.completed_at,
-            updated_by_email=getattr(created_issue, 'updated_by_email', None),
-            updated_at=getattr(created_issue, 'updated_at', None),
-            admin_completed_at=getattr(created_issue, 'admin_completed_at', None),
-            user_completed_at=getattr(created_issue, 'user_completed_at', None),
-            admin_completed_by=getattr(created_issue, 'admin_completed_by', None),
-            user_completed_by=getattr(created_issue, 'user_completed_by', None)
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing issue: {str(e)}")
+    return IssueResponse.from_db(created_issue)
 
 @app.get("/issues", response_model=List[IssueResponse])
 async def get_issues(
+    request: Request,
     category: str = None,
     status: str = None,
     limit: int = 100,
-    skip: int = 0
+    skip: int = 0,
+    lite: bool = False
 ):
     """
     Get all issues from the database with optional filtering and pagination
@@ -203,82 +341,40 @@ async def get_issues(
     - status: Filter by issue status (e.g., "new", "in_progress", "resolved")
     - limit: Maximum number of issues to return (default: 100, max: 1000)
     - skip: Number of issues to skip for pagination (default: 0)
+    - lite: Leave out the photo field (default: false)
     """
-    try:
-        # Validate pagination parameters
-        if limit > 1000:
-            limit = 1000
-        if limit < 1:
-            limit = 100
-        if skip < 0:
-            skip = 0
+    # Validate pagination parameters
+    if limit > 1000:
+        limit = 1000
+    if limit < 1:
+        limit = 100
+    if skip < 0:
+        skip = 0
             
-        issues = await get_all_issues()
-        
-        # Apply filters
-        filtered_issues = []
-        for issue in issues:
-            # Category filter
-            if category and issue.category != category:
-                continue
-            # Status filter
-            if status and issue.status != status:
-                continue
-            filtered_issues.append(issue)
-        
-        # Apply pagination
-        paginated_issues = filtered_issues[skip:skip + limit]
+    cache_key = f"{ISSUES_CACHE_NAMESPACE}:list:{category}|{status}|{skip}|{limit}|{lite}"
+    cached_issues = await cache_service.get(cache_key)
+    if cached_issues is not None:
+        return _etag_response(request, cached_issues)
+            
+    # Filtering and pagination happen in the database query
+    paginated_issues = await get_filtered_issues(category, status, skip, limit, lite)
         
-        return [
-            IssueResponse(
-                ticket_id=issue.ticket_id,
-                category=issue.category,
-                address=issue.address,
-                location=issue.location,
-                description=issue.description,
-                title=issue.title,
-                photo=issue.photo,
-                status=issue.status,
-                created_at=issue.created_at,
-                users=issue.users,
-                issue_count=issue.issue_count,
-                original_text=issue.original_text,
-                in_progress_at=issue.in_progress_at,
-                completed_at=issue.completed_at,
-                updated_by_email=getattr(issue, 'updated_by_email', None),
-                updated_at=getattr(issue, 'updated_at', None),
-                admin_completed_at=getattr(issue, 'admin_completed_at', None),
-                user_completed_at=getattr(issue, 'user_completed_at', None),
-                admin_completed_by=getattr(issue, 'admin_completed_by', None),
-                user_completed_by=getattr(issue, 'user_completed_by', None)
-            )
-            for issue in paginated_issues
-        ]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching issues: {str(e)}")
+    issue_payload = _serialize_issues(paginated_issues)
+    await cache_service.set(cache_key, issue_payload, ttl=30)
+    return _etag_response(request, issue_payload)
 
 @app.get("/issues/categories")
-async def get_issue_categories():
+async def get_issue_categories(request: Request):
     """
     Get all available issue categories
     """
-    categories = [
-        "Sanitation & Waste",
-        "Water & Drainage", 
-        "Electricity & Streetlights",
-        "Roads & Transport",
-        "Public Health & Safety",
-        "Environment & Parks",
-        "Building & Infrastructure",
-        "Taxes & Documentation",
-        "Emergency Services",
-        "Animal Care & Control",
-        "Other"
-    ]
-    return {"categories": categories}
+    if request.headers.get("if-none-match") == _CATEGORIES_HEADERS["ETag"]:
+        return Response(status_code=304, headers=_CATEGORIES_HEADERS)
+    return Response(content=_CATEGORIES_BODY, media_type="application/json", headers=_CATEGORIES_HEADERS)
 
 @app.get("/issues/count")
 async def get_issues_count(
+    request: Request,
     category: str = None,
     status: str = None
 ):
@@ -289,28 +385,45 @@ async def get_issues_count(
     - category: Filter by issue category
     - status: Filter by issue status
     """
-    try:
-        issues = await get_all_issues()
+    cache_key = f"{ISSUES_CACHE_NAMESPACE}:count:{category}|{status}"
+    cached_count = await cache_service.get(cache_key)
+    if cached_count is not None:
+        return _etag_response(request, cached_count)
         
-        # Apply filters
-        filtered_issues = []
-        for issue in issues:
-            if category and issue.category != category:
-                continue
-            if status and issue.status != status:
-                continue
-            filtered_issues.append(issue)
+    total_count = await count_filtered_issues(category, status)
         
-        return {
-            "total_count": len(filtered_issues),
-            "category": category,
-            "status": status
-        }
+    count_response = {
+        "total_count": total_count,
+        "category": category,
+        "status": status
+    }
+    await cache_service.set(cache_key, count_response, ttl=60)
+    return _etag_response(request, count_response)
+
+async def _send_status_update_notifications(users_list: List[str], ticket_id: str, previous_status: str, new_status: str):
+    """Send the bilingual status update SMS to every reporter that is a phone number"""
+    try:
+        phones = []
+        for user_identifier in users_list:
+            # Check if user_identifier is a phone number (starts with + or contains only digits)
+            if _PHONE_RE.match(user_identifier):
+                phones.append(user_identifier)
+            else:
+                logger.debug("   ℹ️  Skipping %s (not a phone number)", user_identifier)
+
+        sms_sent_count = await telerivet_service.send_status_update_sms_bulk(
+            phones,
+            ticket_id,
+            previous_status,
+            new_status
+        )
+        logger.debug("✅ Status update SMS notifications completed - %s SMS sent", sms_sent_count)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error counting issues: {str(e)}")
+        # Background tasks have no caller to report to - log instead of raising
+        logger.exception("Error sending status update notifications for %s: %s", ticket_id, e)
 
 @app.put("/issues/{ticket_id}/status")
-async def update_issue_status(ticket_id: str, status_update: StatusUpdateRequest):
+async def update_issue_status(ticket_id: str, status_update: StatusUpdateRequest, background_tasks: BackgroundTasks):
     """
     Update the status of an existing issue by ticket ID
     
@@ -324,116 +437,70 @@ async def update_issue_status(ticket_id: str, status_update: StatusUpdateRequest
         "email": "user@example.com"
     }
     
-    Valid status values: "new", "in_progress", "resolved", "closed", "rejected"
+    Valid status values: "new", "in_progress" (or "in progress"), "admin_completed".
+    Anything else is rejected with 422 during request validation.
     """
-    try:
-        print(f"Received status update request for ticket: {ticket_id}")
-        print(f"Status update data: {status_update}")
-        
-        # Validate status value
-        new_status = status_update.status
-        updated_by_email = status_update.email
-        print(f"New status: {new_status}")
-        print(f"Updated by email: {updated_by_email}")
-        
-        # Define valid status values (only 3 types as requested)
-        valid_statuses = [
-            "new", 
-            "in_progress", 
-            "in progress", 
-            "admin_completed"  # New status for admin completion
-        ]
-        
-        # Normalize the status (convert "in progress" to "in_progress")
-        normalized_status = new_status
-        if new_status == "in progress":
-            normalized_status = "in_progress"
-        
-        print(f"Status normalization: '{new_status}' -> '{normalized_status}'")
-        
-        if new_status not in valid_statuses:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
-            )
-        
-        # Prevent direct completion - must use completion endpoint
-        if normalized_status == "completed":
-            raise HTTPException(
-                status_code=400, 
-                detail="Cannot directly set status to 'completed'. Use the completion endpoint to mark completion by admin and user."
-            )
-        
-        # Find and update the issue
-        updated_issue = await update_issue_status_in_db(ticket_id, normalized_status, updated_by_email)
-        
-        if not updated_issue:
-            raise HTTPException(status_code=404, detail=f"Issue with ticket ID {ticket_id} not found")
-        
-        # Send SMS notifications to users when status changes to in_progress or completed
-        previous_status = updated_issue.get("previous_status", "unknown")
-        print(f"📊 Status Update: {previous_status} → {normalized_status}")
-
-        if normalized_status in ["in_progress", "completed", "admin_completed"]:
-            # Only send SMS if status actually changed
-            if previous_status != normalized_status:
-                print(f"📲 Status changed - sending SMS notifications to all reporters")
-                users_list = updated_issue.get("users", [])
-                print(f"   👥 Number of users to notify: {len(users_list)}")
-
-                if users_list:
-                    sms_sent_count = 0
-                    for user_identifier in users_list:
-                        # Check if user_identifier is a phone number (starts with + or contains only digits)
-                        if user_identifier.startswith("+") or (user_identifier.replace(" ", "").replace("-", "").isdigit() and len(user_identifier.replace(" ", "").replace("-", "")) >= 10):
-                            print(f"   📱 Sending SMS to: {user_identifier}")
-                            try:
-                                await telerivet_service.send_status_update_sms_bilingual(
-                                    user_identifier,
-                                    ticket_id,
-                                    previous_status,
-                                    normalized_status
-                                )
-                                sms_sent_count += 1
-                                print(f"   ✅ SMS sent successfully")
-                            except Exception as sms_error:
-                                print(f"   ⚠️ Error sending SMS to {user_identifier}: {sms_error}")
-                                logger.error(f"Error sending SMS notification: {sms_error}")
-                        else:
-                            print(f"   ℹ️  Skipping {user_identifier} (not a phone number)")
-
-                    print(f"✅ Status update SMS notifications completed - {sms_sent_count} SMS sent")
-                else:
-                    print(f"ℹ️  No users to notify")
+    logger.debug("Received status update request for ticket: %s", ticket_id)
+    logger.debug("Status update data: %s", status_update)
+        
+    # Status is validated and normalized by StatusUpdateRequest
+    normalized_status = status_update.status.value
+    updated_by_email = status_update.email
+    logger.debug("New status: %s", normalized_status)
+    logger.debug("Updated by email: %s", updated_by_email)
+        
+    # Find and update the issue
+    updated_issue = await update_issue_status_in_db(ticket_id, normalized_status, updated_by_email)
+        
+    if not updated_issue:
+        raise HTTPException(status_code=404, detail=f"Issue with ticket ID {ticket_id} not found")
+        
+    # Send SMS notifications to users when status changes to in_progress or completed
+    previous_status = updated_issue.get("previous_status", "unknown")
+    logger.debug("📊 Status Update: %s → %s", previous_status, normalized_status)
+
+    if normalized_status in _SMS_NOTIFY_STATUSES:
+        # Only send SMS if status actually changed
+        if previous_status != normalized_status:
+            logger.debug("📲 Status changed - sending SMS notifications to all reporters")
+            users_list = updated_issue.get("users", [])
+            logger.debug("   👥 Number of users to notify: %s", len(users_list))
+
+            if users_list:
+                # Send after the response so the SMS round trips don't add to request latency
+                background_tasks.add_task(
+                    _send_status_update_notifications,
+                    users_list,
+                    ticket_id,
+                    previous_status,
+                    normalized_status
+                )
             else:
-                print(f"ℹ️  Status unchanged - skipping SMS notifications")
+                logger.debug("ℹ️  No users to notify")
         else:
-            print(f"ℹ️  Status '{normalized_status}' doesn't trigger SMS notifications")
-
-        # Prepare response with timestamp information
-        response_data = {
-            "message": "Issue status updated successfully",
-            "ticket_id": ticket_id,
-            "old_status": updated_issue.get("previous_status"),
-            "new_status": normalized_status,
-            "updated_by_email": updated_by_email,
-            "updated_at": datetime.now().strftime("%H:%M %d-%m-%Y")
-        }
-        
-        # Add timestamp information if status was changed to in_progress or completed
-        if normalized_status == "in_progress" and updated_issue.get("in_progress_at"):
-            response_data["in_progress_at"] = updated_issue.get("in_progress_at")
+            logger.debug("ℹ️  Status unchanged - skipping SMS notifications")
+    else:
+        logger.debug("ℹ️  Status '%s' doesn't trigger SMS notifications", normalized_status)
+
+    # Prepare response with timestamp information
+    response_data = {
+        "message": "Issue status updated successfully",
+        "ticket_id": ticket_id,
+        "old_status": updated_issue.get("previous_status"),
+        "new_status": normalized_status,
+        "updated_by_email": updated_by_email,
+        # Echo the stored write time rather than reading the clock again
+        "updated_at": format_timestamp(updated_issue.get("updated_at"))
+    }
         
-        if normalized_status == "completed" and updated_issue.get("completed_at"):
-            response_data["completed_at"] = updated_issue.get("completed_at")
+    # Add timestamp information if status was changed to in_progress or completed
+    if normalized_status == "in_progress" and updated_issue.get("in_progress_at"):
+        response_data["in_progress_at"] = format_timestamp(updated_issue.get("in_progress_at"))
         
-        return response_data
+    if normalized_status == "completed" and updated_issue.get("completed_at"):
+        response_data["completed_at"] = format_timestamp(updated_issue.get("completed_at"))
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Error in update_issue_status: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error updating issue status: {str(e)}")
+    return response_data
 
 @app.post("/issues/{ticket_id}/complete", response_model=CompletionResponse)
 async def mark_issue_completion_endpoint(ticket_id: str, completion_request: CompletionRequest):
@@ -455,77 +522,48 @@ async def mark_issue_completion_endpoint(ticket_id: str, completion_request: Com
     - User can only mark completion after admin has marked it
     - Issue is fully completed only when both admin and user have marked it
     """
-    try:
-        print(f"Received completion request for ticket: {ticket_id}")
-        print(f"Completion data: {completion_request}")
+    logger.debug("Received completion request for ticket: %s", ticket_id)
+    logger.debug("Completion data: %s", completion_request)
         
-        completion_type = completion_request.completion_type
-        completed_by_email = completion_request.email
-        
-        # Validate completion type
-        if completion_type not in ["admin", "user"]:
-            raise HTTPException(
-                status_code=400, 
-                detail="Invalid completion_type. Must be 'admin' or 'user'"
-            )
+    completion_type = completion_request.completion_type
+    completed_by_email = completion_request.email
         
-        # Get current issue data to check completion status
-        if issues_collection is not None:
-            try:
-                from bson import ObjectId
-                current_issue = await issues_collection.find_one({"ticket_id": ticket_id})
-            except Exception as e:
-                print(f"Error querying current issue: {e}")
-                current_issue = None
-        else:
-            # Use in-memory storage
-            current_issue = None
-            for issue in _in_memory_issues:
-                if issue.get("ticket_id") == ticket_id:
-                    current_issue = issue
-                    break
-        
-        if not current_issue:
-            raise HTTPException(status_code=404, detail=f"Issue with ticket ID {ticket_id} not found")
-        
-        # Validation: User cannot mark completion before admin
-        if completion_type == "user":
-            admin_completed = current_issue.get("admin_completed_at")
-            if not admin_completed:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="Admin must mark completion first before user can mark completion"
-                )
-        
-        # Mark completion in database
-        updated_issue = await mark_issue_completion(ticket_id, completion_type, completed_by_email)
+    # Validate completion type
+    if completion_type not in _COMPLETION_TYPES:
+        raise HTTPException(
+            status_code=400, 
+            detail="Invalid completion_type. Must be 'admin' or 'user'"
+        )
         
-        if not updated_issue:
-            raise HTTPException(status_code=404, detail=f"Issue with ticket ID {ticket_id} not found")
+    # Mark completion in database - the admin-first rule is enforced there
+    completion_status, updated_issue = await mark_issue_completion(ticket_id, completion_type, completed_by_email)
         
-        # Check if both completions are done
-        admin_completed = updated_issue.get("admin_completed_at")
-        user_completed = updated_issue.get("user_completed_at")
-        is_fully_completed = bool(admin_completed and user_completed)
-
-        # Prepare response
-        response_data = {
-            "message": f"Issue marked as {completion_type} completed successfully",
-            "ticket_id": ticket_id,
-            "completion_type": completion_type,
-            "completed_by": completed_by_email,
-            "completed_at": datetime.now().strftime("%H:%M %d-%m-%Y"),
-            "current_status": updated_issue.get("status", "unknown"),
-            "is_fully_completed": is_fully_completed
-        }
+    if completion_status == "admin_required":
+        raise HTTPException(
+            status_code=400, 
+            detail="Admin must mark completion first before user can mark completion"
+        )
         
-        return response_data
+    if not updated_issue:
+        raise HTTPException(status_code=404, detail=f"Issue with ticket ID {ticket_id} not found")
+        
+    # Check if both completions are done
+    admin_completed = updated_issue.get("admin_completed_at")
+    user_completed = updated_issue.get("user_completed_at")
+    is_fully_completed = bool(admin_completed and user_completed)
+
+    # Prepare response
+    response_data = {
+        "message": f"Issue marked as {completion_type} completed successfully",
+        "ticket_id": ticket_id,
+        "completion_type": completion_type,
+        "completed_by": completed_by_email,
+        "completed_at": format_timestamp(updated_issue.get(f"{completion_type}_completed_at")),
+        "current_status": updated_issue.get("status", "unknown"),
+        "is_fully_completed": is_fully_completed
+    }
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Error in mark_issue_completion_endpoint: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error marking issue completion: {str(e)}")
+    return response_data
 
 @app.post("/issues/user", response_model=List[IssueResponse])
 async def get_user_issues(user_email_request: UserEmailRequest):
@@ -543,48 +581,29 @@ async def get_user_issues(user_email_request: UserEmailRequest):
     Returns:
     - List of all issues where the user's email is in the users array
     """
-    try:
-        user_email = user_email_request.email
+    user_email = user_email_request.email
         
-        # Get issues for the user
-        user_issues = await get_issues_by_user_email(user_email)
-        
-        # Convert to response format
-        return [
-            IssueResponse(
-                ticket_id=issue.ticket_id,
-                category=issue.category,
-                address=issue.address,
-                location=issue.location,
-                description=issue.description,
-                title=issue.title,
-                photo=issue.photo,
-                status=issue.status,
-                created_at=issue.created_at,
-                users=issue.users,
-                issue_count=issue.issue_count,
-                original_text=issue.original_text,
-                in_progress_at=issue.in_progress_at,
-                completed_at=issue.completed_at,
-                updated_by_email=getattr(issue, 'updated_by_email', None),
-                updated_at=getattr(issue, 'updated_at', None),
-                admin_completed_at=getattr(issue, 'admin_completed_at', None),
-                user_completed_at=getattr(issue, 'user_completed_at', None),
-                admin_completed_by=getattr(issue, 'admin_completed_by', None),
-                user_completed_by=getattr(issue, 'user_completed_by', None)
-            )
-            for issue in user_issues
-        ]
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching user issues: {str(e)}")
+    # Stream the user's issues straight from the cursor - this list is
+    # unpaginated, so it is never built up in memory
+    return StreamingResponse(
+        _stream_issues(iter_issues_by_user_email(user_email)),
+        media_type="application/json"
+    )
+
+# Health responses are rebuilt at most once per second
+_health_response = {"second": None, "body": None}
 
 @app.get("/health")
-async def health_check():
+async def health_check(response: Response):
     """
     Health check endpoint
     """
-    return {"status": "healthy", "timestamp": datetime.now().strftime("%H:%M %d-%m-%Y")}
+    response.headers["Cache-Control"] = "max-age=1"
+    current_second = int(time.monotonic())
+    if _health_response["second"] != current_second:
+        _health_response["body"] = {"status": "healthy", "timestamp": now_fmt()}
+        _health_response["second"] = current_second
+    return _health_response["body"]
 
 # Role-based authentication endpoints
 @app.post("/auth/register")
@@ -592,42 +611,37 @@ async def register_user(user_data: UserRegistration):
     """
     Register a new user with role-based access
     """
-    try:
-        result = await auth_service.register_user(user_data)
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(status_code=400, detail=result["message"])
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
+    result = await auth_service.register_user(user_data)
+    if result["success"]:
+        _PROFILE_CACHE.pop(user_data.email, None)
+        return result
+    else:
+        raise HTTPException(status_code=400, detail=result["message"])
 
 @app.post("/auth/login")
 async def login_user(login_data: UserLogin):
     """
     Authenticate user and return user information
     """
-    try:
-        result = await auth_service.authenticate_user(login_data.email, login_data.password)
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(status_code=401, detail=result["message"])
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Authentication failed: {str(e)}")
+    result = await auth_service.authenticate_user(login_data.email, login_data.password)
+    if result["success"]:
+        return result
+    else:
+        raise HTTPException(status_code=401, detail=result["message"])
 
 @app.get("/auth/profile/{email}")
 async def get_user_profile(email: str):
     """
     Get user profile information
     """
-    try:
-        result = await auth_service.get_user_profile(email)
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(status_code=404, detail=result["message"])
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get profile: {str(e)}")
+    if email in _PROFILE_CACHE:
+        return _PROFILE_CACHE[email]
+    result = await auth_service.get_user_profile(email)
+    if result["success"]:
+        _PROFILE_CACHE[email] = result
+        return result
+    else:
+        raise HTTPException(status_code=404, detail=result["message"])
 
 # Department management endpoints
 @app.get("/departments", response_model=List[Department])
@@ -635,112 +649,100 @@ async def get_departments():
     """
     Get all active departments
     """
-    try:
-        departments = await get_all_departments()
-        return departments
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching departments: {str(e)}")
+    departments = await get_all_departments()
+    return _models_response(departments)
 
 @app.post("/departments", response_model=Department)
 async def create_department_endpoint(department_data: dict):
     """
     Create a new department
     """
-    try:
-        from .database import create_department
-        department = await create_department(department_data)
-        return department
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error creating department: {str(e)}")
+    from .database import create_department
+    department = await create_department(department_data)
+    return department
 
 # Worker management endpoints
 @app.get("/workers", response_model=List[WorkerProfile])
-async def get_workers(department_id: str = None):
+async def get_workers(request: Request, department_id: str = None):
     """
     Get all workers, optionally filtered by department
     """
-    try:
-        if department_id:
-            workers = await get_workers_by_department(department_id)
-        else:
-            workers = await get_all_workers()
-        return workers
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching workers: {str(e)}")
+    if department_id:
+        return await _cached_department_workers(request, department_id)
+        
+    cache_key = f"{WORKERS_CACHE_NAMESPACE}:all"
+    cached_workers = await cache_service.get(cache_key)
+    if cached_workers is not None:
+        return _etag_response(request, cached_workers)
+        
+    worker_payload = [_dump_model(worker) async for worker in iter_all_workers()]
+    await cache_service.set(cache_key, worker_payload, ttl=30)
+    return _etag_response(request, worker_payload)
 
 @app.get("/workers/{email}", response_model=WorkerProfile)
 async def get_worker_by_email_endpoint(email: str):
     """
     Get worker profile by email
     """
-    try:
-        worker = await get_worker_by_email(email)
-        if not worker:
-            raise HTTPException(status_code=404, detail="Worker not found")
-        return worker
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching worker: {str(e)}")
+    worker = await get_worker_by_email(email)
+    if not worker:
+        raise HTTPException(status_code=404, detail="Worker not found")
+    return worker
 
 # Issue assignment endpoints
 @app.post("/assignments", response_model=AssignmentResponse)
 async def create_assignment_endpoint(assignment_request: AssignmentRequest, assigned_by_email: str = "admin@example.com"):
     """Create a new assignment"""
-    try:
-        # Verify issue exists
-        issues = await get_all_issues()
-        issue = next((i for i in issues if i.ticket_id == assignment_request.ticket_id), None)
-        if not issue:
-            raise HTTPException(status_code=404, detail="Issue not found")
-        
-        # Verify worker exists
-        worker = await get_worker_by_email(assignment_request.assigned_to)
-        if not worker:
-            raise HTTPException(status_code=404, detail="Worker not found")
-        
-        # Check for existing assignment
-        existing_assignment = await get_assignment_by_ticket(assignment_request.ticket_id)
-        if existing_assignment:
-            raise HTTPException(status_code=400, detail="Issue is already assigned")
+    # The issue and worker checks are independent - run them concurrently
+    issue_found, worker = await asyncio.gather(
+        issue_exists(assignment_request.ticket_id),
+        get_worker_by_email(assignment_request.assigned_to)
+    )
+    if not issue_found:
+        raise HTTPException(status_code=404, detail="Issue not found")
         
-        # Create assignment data
-        assignment_data = {
-            "ticket_id": assignment_request.ticket_id,
-            "assigned_to": assignment_request.assigned_to,
-            "assigned_by": assigned_by_email,
-            "assigned_at": datetime.now().strftime("%H:%M %d-%m-%Y"),
-            "status": "assigned",
-            "notes": assignment_request.notes or ""
-        }
+    if not worker:
+        raise HTTPException(status_code=404, detail="Worker not found")
         
-        # Create the assignment
-        assignment = await create_issue_assignment(assignment_data)
-
-        # Update issue status to in_progress
-        await update_issue_status_in_db(assignment_request.ticket_id, "in_progress", assigned_by_email)
-
-        return AssignmentResponse(
-            message="Issue assigned successfully",
-            assignment_id=str(assignment.id) if hasattr(assignment, 'id') else str(assignment._id),
-            ticket_id=assignment.ticket_id,
-            assigned_to=assignment.assigned_to,
-            assigned_by=assignment.assigned_by,
-            assigned_at=assignment.assigned_at,
-            status=assignment.status
-        )
+    # Create assignment data
+    assignment_data = {
+        "ticket_id": assignment_request.ticket_id,
+        "assigned_to": assignment_request.assigned_to,
+        "assigned_by": assigned_by_email,
+        "assigned_at": now_dt(),
+        "status": "assigned",
+        "notes": assignment_request.notes or ""
+    }
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error creating assignment: {str(e)}")
+    # Create the assignment - the unique ticket_id index rejects duplicates
+    assignment = await create_issue_assignment(assignment_data)
+    if assignment is None:
+        raise HTTPException(status_code=400, detail="Issue is already assigned")
+
+    # Only a created assignment bumps the worker's workload; move the issue to
+    # in_progress and flag it as assigned at the same time
+    await asyncio.gather(
+        increment_worker_workload(assignment_request.assigned_to),
+        update_issue_status_in_db(assignment_request.ticket_id, "in_progress", assigned_by_email),
+        set_issue_assigned(assignment_request.ticket_id)
+    )
+
+    return AssignmentResponse(
+        message="Issue assigned successfully",
+        assignment_id=str(assignment.id),
+        ticket_id=assignment.ticket_id,
+        assigned_to=assignment.assigned_to,
+        assigned_by=assignment.assigned_by,
+        assigned_at=assignment.assigned_at,
+        status=assignment.status
+    )
 
 
 
 @app.get("/assignments/worker/{worker_email}", response_model=List[IssueAssignment])
 async def get_worker_assignments_endpoint(worker_email: str):
     """Get all assignments for a specific worker"""
-    return await get_assignments_by_worker(worker_email)
+    return _models_response(await get_assignments_by_worker(worker_email))
 
 
 @app.put("/assignments/{ticket_id}/status")
@@ -748,229 +750,102 @@ async def update_assignment_status_endpoint(ticket_id: str, status: str, notes:
     """
     Update assignment status
     """
-    try:
-        assignment = await update_assignment_status(ticket_id, status, notes)
-        if not assignment:
-            raise HTTPException(status_code=404, detail="Assignment not found")
-        
-        return {
-            "message": "Assignment status updated successfully",
-            "ticket_id": ticket_id,
-            "status": status,
-            "updated_at": datetime.now().strftime("%H:%M %d-%m-%Y")
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error updating assignment: {str(e)}")
+    assignment = await update_assignment_status(ticket_id, status, notes)
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+        
+    return {
+        "message": "Assignment status updated successfully",
+        "ticket_id": ticket_id,
+        "status": status,
+        "updated_at": now_fmt()
+    }
 
 # in main.py
 
 @app.post("/workers/register", response_model=UserResponse)
 async def register_worker(worker_data: dict):
     """Register a new worker"""
-    try:
-        # Automatically add the 'role' for worker registration
-        worker_data['role'] = UserRole.WORKER
+    # Automatically add the 'role' for worker registration
+    worker_data["role"] = UserRole.WORKER.value
         
-        # This is the fix: Let Pydantic create the object directly from the dictionary.
-        # This is more robust and prevents data from being lost.
-        user_registration = UserRegistration(**worker_data)
+    # This is the fix: Let Pydantic create the object directly from the dictionary.
+    # This is more robust and prevents data from being lost.
+    user_registration = UserRegistration.model_validate(worker_data)
         
-        # Now, call the auth service with the correctly populated object
-        result = await auth_service.register_user(user_registration)
+    # Now, call the auth service with the correctly populated object
+    result = await auth_service.register_user(user_registration)
         
-        if result["success"]:
-            # The result from the service contains a nested 'user' object
-            return UserResponse(**result["user"])
-        else:
-            raise HTTPException(status_code=400, detail=result.get("message", "Registration failed."))
+    if result["success"]:
+        _PROFILE_CACHE.pop(user_registration.email, None)
+        # The result from the service contains a nested 'user' object
+        return UserResponse.model_validate(result["user"])
+    else:
+        raise HTTPException(status_code=400, detail=result.get("message", "Registration failed."))
+
 
-    except Exception as e:
-        # This will log the actual error to your Render logs for easier debugging
-        print(f"CRASH in /workers/register: {e}") 
-        raise HTTPException(status_code=500, detail=f"Worker registration failed: {str(e)}")
-    
 @app.post("/workers/login")
 async def worker_login(login_data: UserLogin):
     """Worker login endpoint"""
-    try:
-        result = await auth_service.authenticate_user(login_data.email, login_data.password)
+    result = await auth_service.authenticate_user(login_data.email, login_data.password)
         
-        if result["success"] and result["user"]["role"] == UserRole.WORKER.value:
-            return result
-        elif result["success"] and result["user"]["role"] != UserRole.WORKER.value:
-            raise HTTPException(status_code=403, detail="Access denied. Worker account required.")
-        else:
-            raise HTTPException(status_code=401, detail=result["message"])
-    
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Worker login failed: {str(e)}")
-
-@app.get("/workers", response_model=List[WorkerProfile])
-async def get_all_workers_endpoint():
-    """Get all active workers"""
-    try:
-        workers = await get_all_workers()
-        return workers
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching workers: {str(e)}")
+    if result["success"] and result["user"]["role"] == UserRole.WORKER.value:
+        return result
+    elif result["success"] and result["user"]["role"] != UserRole.WORKER.value:
+        raise HTTPException(status_code=403, detail="Access denied. Worker account required.")
+    else:
+        raise HTTPException(status_code=401, detail=result["message"])
 
 @app.get("/workers/department/{department_id}", response_model=List[WorkerProfile])
-async def get_workers_by_department_endpoint(department_id: str):
+async def get_workers_by_department_endpoint(request: Request, department_id: str):
     """Get workers by department ID"""
-    try:
-        workers = await get_workers_by_department(department_id)
-        return workers
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching workers by department: {str(e)}")
+    return await _cached_department_workers(request, department_id)
 
 @app.get("/workers/profile/{email}", response_model=WorkerProfile)
 async def get_worker_profile_endpoint(email: str):
     """Get worker profile by email"""
-    try:
-        worker = await get_worker_by_email(email)
-        if not worker:
-            raise HTTPException(status_code=404, detail="Worker not found")
-        return worker
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching worker profile: {str(e)}")
+    worker = await get_worker_by_email(email)
+    if not worker:
+        raise HTTPException(status_code=404, detail="Worker not found")
+    return worker
 
 # ============= ASSIGNMENT ROUTES =============
 
 @app.get("/assignments", response_model=List[IssueAssignment])
 async def get_all_assignments():
     """Get all assignments"""
-    try:
-        from .database import get_all_assignments
-        all_assignments = await get_all_assignments()
-        return all_assignments
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching assignments: {str(e)}")
-
-@app.post("/assignments", response_model=AssignmentResponse)
-async def create_assignment_endpoint(assignment_request: AssignmentRequest, assigned_by_email: str = "admin@example.com"):
-    """Create a new assignment"""
-    try:
-        issues = await get_all_issues()
-        issue = next((i for i in issues if i.ticket_id == assignment_request.ticket_id), None)
-        if not issue:
-            raise HTTPException(status_code=404, detail="Issue not found")
-        
-        worker = await get_worker_by_email(assignment_request.assigned_to)
-        if not worker:
-            raise HTTPException(status_code=404, detail="Worker not found")
-        
-        existing_assignment = await get_assignment_by_ticket(assignment_request.ticket_id)
-        if existing_assignment:
-            raise HTTPException(status_code=400, detail="Issue is already assigned")
-        
-        assignment_data = {
-            "ticket_id": assignment_request.ticket_id,
-            "assigned_to": assignment_request.assigned_to,
-            "assigned_by": assigned_by_email,
-            "assigned_at": datetime.now().strftime("%H:%M %d-%m-%Y"),
-            "status": "assigned",
-            "notes": assignment_request.notes or ""
-        }
-        
-        assignment = await create_issue_assignment(assignment_data)
-        await update_issue_status_in_db(assignment_request.ticket_id, "in_progress", assigned_by_email)
-        
-        try:
-            current_workload = getattr(worker, 'current_workload', 0)
-            await update_worker_profile(assignment_request.assigned_to, {
-                "current_workload": current_workload + 1
-            })
-        except Exception as e:
-            print(f"Warning: Could not update worker workload: {e}")
-
-        return AssignmentResponse(
-            message="Issue assigned successfully",
-            assignment_id=assignment.id if hasattr(assignment, 'id') else str(assignment._id),
-            ticket_id=assignment.ticket_id,
-            assigned_to=assignment.assigned_to,
-            assigned_by=assignment.assigned_by,
-            assigned_at=assignment.assigned_at,
-            status=assignment.status
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error creating assignment: {str(e)}")
-
-@app.get("/assignments/worker/{worker_email}", response_model=List[IssueAssignment])
-async def get_worker_assignments_endpoint(worker_email: str):
-    """Get all assignments for a specific worker"""
-    try:
-        assignments = await get_assignments_by_worker(worker_email)
-        return assignments
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching worker assignments: {str(e)}")
+    return StreamingResponse(_stream_models(iter_all_assignments()), media_type="application/json")
 
 @app.get("/issues/unassigned")
 async def get_unassigned_issues():
     """Get issues that haven't been assigned to any worker"""
-    try:
-        all_issues = await get_all_issues()
-        
-        if assignments_collection is not None:
-            try:
-                assigned_tickets = set()
-                cursor = assignments_collection.find({}, {"ticket_id": 1})
-                async for assignment in cursor:
-                    assigned_tickets.add(assignment["ticket_id"])
-            except Exception as e:
-                print(f"Error querying assignments: {e}")
-                assigned_tickets = set()
-        else:
-            from .database import _in_memory_assignments
-            assigned_tickets = {assignment.get("ticket_id") for assignment in _in_memory_assignments}
-        
-        unassigned_issues = [
-            issue for issue in all_issues 
-            if issue.ticket_id not in assigned_tickets
-        ]
-        
-        return [
-            IssueResponse(
-                ticket_id=issue.ticket_id,
-                category=issue.category,
-                address=issue.address,
-                location=issue.location,
-                description=issue.description,
-                title=issue.title,
-                photo=issue.photo,
-                status=issue.status,
-                created_at=issue.created_at,
-                users=issue.users,
-                issue_count=issue.issue_count,
-                original_text=issue.original_text,
-                in_progress_at=issue.in_progress_at,
-                completed_at=issue.completed_at,
-                updated_by_email=getattr(issue, 'updated_by_email', None),
-                updated_at=getattr(issue, 'updated_at', None),
-                admin_completed_at=getattr(issue, 'admin_completed_at', None),
-                user_completed_at=getattr(issue, 'user_completed_at', None),
-                admin_completed_by=getattr(issue, 'admin_completed_by', None),
-                user_completed_by=getattr(issue, 'user_completed_by', None)
-            )
-            for issue in unassigned_issues
-        ]
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching unassigned issues: {str(e)}")
+    return StreamingResponse(_stream_issues(iter_unassigned_issues()), media_type="application/json")
 
 
 # ============= TELERIVET SMS WEBHOOK =============
 
+async def _claim_message_id(message_id: str) -> bool:
+    """
+    Record a webhook message ID as processed. Returns False if it was already
+    processed. Uses Redis (shared by every worker) when configured, otherwise
+    the in-process _processed_messages map.
+    """
+    claimed = await cache_service.add(f"{_PROCESSED_MESSAGES_NAMESPACE}:{message_id}", ttl=_PROCESSED_MESSAGES_TTL)
+    if claimed is not None:
+        return claimed
+
+    if message_id in _processed_messages:
+        _processed_messages.move_to_end(message_id)
+        return False
+
+    # New message - evict the oldest past the limit
+    _processed_messages[message_id] = time.time()
+    if len(_processed_messages) > _PROCESSED_MESSAGES_MAX:
+        _processed_messages.popitem(last=False)
+    return True
+
 @app.post("/telerivet/webhook")
-async def telerivet_webhook(request: Request):
+async def telerivet_webhook(request: Request, background_tasks: BackgroundTasks):
     """
     Telerivet webhook endpoint to receive incoming SMS messages
 
@@ -995,13 +870,13 @@ async def telerivet_webhook(request: Request):
             form_data = await request.form()
             webhook_data = dict(form_data)
 
-        print("=" * 50)
-        print("📨 TELERIVET WEBHOOK RECEIVED")
-        print(f"Content-Type: {content_type}")
-        print(f"Data keys: {list(webhook_data.keys())}")
-        print(f"Full data: {webhook_data}")
-        print("=" * 50)
-        logger.info(f"Received Telerivet webhook: {webhook_data}")
+        logger.debug("=" * 50)
+        logger.debug("📨 TELERIVET WEBHOOK RECEIVED")
+        logger.debug("Content-Type: %s", content_type)
+        logger.debug("Data keys: %s", list(webhook_data.keys()))
+        logger.debug("Full data: %s", webhook_data)
+        logger.debug("=" * 50)
+        logger.info("Received Telerivet webhook: %s", webhook_data)
 
         # === CRITICAL FILTERING SECTION ===
         # Use BLACKLIST approach: Only reject webhooks we KNOW are not incoming user messages
@@ -1009,54 +884,33 @@ async def telerivet_webhook(request: Request):
 
         # 1. BLACKLIST: Reject known outgoing/status event types
         event_type = webhook_data.get('event', '').lower().strip()
-        print(f"🔍 Event type: '{event_type}'")
-
-        # List of events we DON'T want to process (outgoing messages, status updates, etc.)
-        BLACKLISTED_EVENTS = [
-            'send_status',      # When bot sends a message
-            'delivery_status',  # Delivery confirmation
-            'sent',            # Message sent event
-            'delivered',       # Message delivered event
-            'failed',          # Send failed event
-            'message_sent',    # Alternative sent event
-        ]
+        logger.debug("🔍 Event type: '%s'", event_type)
 
         if event_type and event_type in BLACKLISTED_EVENTS:
-            print(f"⏭️  IGNORING: Event type '{event_type}' is blacklisted (outgoing/status event)")
-            logger.info(f"Ignored webhook - blacklisted event: {event_type}")
+            logger.info("Ignored webhook - blacklisted event: %s", event_type)
             return {"status": "ignored", "reason": f"blacklisted_event: {event_type}"}
 
-        print(f"✅ Event type OK ('{event_type}' not in blacklist)")
+        logger.debug("✅ Event type OK ('%s' not in blacklist)", event_type)
 
         # 2. BLACKLIST: Reject if direction is explicitly outgoing
         message_direction = webhook_data.get('direction', '').lower().strip()
-        print(f"🔍 Message direction: '{message_direction}'")
+        logger.debug("🔍 Message direction: '%s'", message_direction)
 
-        if message_direction in ['outgoing', 'sent', 'sending']:
-            print(f"⏭️  IGNORING: Direction is '{message_direction}' (outgoing message)")
-            logger.info(f"Ignored webhook - outgoing direction: {message_direction}")
+        if message_direction in OUTGOING_DIRECTIONS:
+            logger.info("Ignored webhook - outgoing direction: %s", message_direction)
             return {"status": "ignored", "reason": f"outgoing_direction: {message_direction}"}
 
-        print(f"✅ Direction OK ('{message_direction}' not outgoing)")
+        logger.debug("✅ Direction OK ('%s' not outgoing)", message_direction)
 
         # 3. BLACKLIST: Reject if status indicates sent/sending (but allow empty/received)
         message_status = webhook_data.get('status', '').lower().strip()
-        print(f"🔍 Message status: '{message_status}'")
-
-        BLACKLISTED_STATUSES = [
-            'sent',
-            'sending',
-            'queued',
-            'failed',
-            'delivered'
-        ]
+        logger.debug("🔍 Message status: '%s'", message_status)
 
         if message_status and message_status in BLACKLISTED_STATUSES:
-            print(f"⏭️  IGNORING: Message status '{message_status}' indicates outgoing/failed message")
-            logger.info(f"Ignored webhook - blacklisted status: {message_status}")
+            logger.info("Ignored webhook - blacklisted status: %s", message_status)
             return {"status": "ignored", "reason": f"blacklisted_status: {message_status}"}
 
-        print(f"✅ Status OK ('{message_status}' not in blacklist)")
+        logger.debug("✅ Status OK ('%s' not in blacklist)", message_status)
 
         # Extract webhook secret for validation (if configured)
         secret = webhook_data.get('secret', '')
@@ -1072,61 +926,42 @@ async def telerivet_webhook(request: Request):
         message_text = sms_data["text"]
         message_id = sms_data["message_id"]
 
-        print(f"📋 Extracted data:")
-        print(f"  📱 Phone: {from_phone}")
-        print(f"  💬 Message: {message_text}")
-        print(f"  🆔 Message ID: {message_id}")
+        logger.debug("📋 Extracted data:")
+        logger.debug("  📱 Phone: %s", from_phone)
+        logger.debug("  💬 Message: %s", message_text)
+        logger.debug("  🆔 Message ID: %s", message_id)
 
         if not message_text:
-            print("❌ ERROR: Empty message text")
             logger.warning("Empty message received")
             return {"status": "error", "message": "Empty message"}
 
         if not from_phone:
-            print("❌ ERROR: No phone number in webhook data")
             logger.warning("No phone number in webhook data")
             return {"status": "error", "message": "No phone number"}
 
         # 4. MESSAGE DEDUPLICATION - Only if message_id exists
         if message_id:
-            print(f"🔍 Checking deduplication for message ID: {message_id}")
-            if message_id in _processed_message_cache:
-                print(f"⏭️  IGNORING: Message ID '{message_id}' already processed")
-                # Check how recently it was processed
-                if message_id in _processed_message_timestamps:
-                    time_ago = time.time() - _processed_message_timestamps[message_id]
-                    print(f"   ⏱️  Originally processed {time_ago:.1f} seconds ago")
-                logger.info(f"Duplicate message ignored - ID: {message_id}")
+            logger.debug("🔍 Checking deduplication for message ID: %s", message_id)
+            if not await _claim_message_id(message_id):
+                logger.info("Duplicate message ignored - ID: %s", message_id)
                 return {"status": "ignored", "reason": "duplicate message ID"}
-
-            # Add to cache - this is a new message
-            _processed_message_cache.append(message_id)
-            _processed_message_timestamps[message_id] = time.time()
-            print(f"✅ Message ID '{message_id}' cached for deduplication")
-
-            # Clean old timestamps (keep only last 1000)
-            if len(_processed_message_timestamps) > 1000:
-                # Remove oldest entries
-                sorted_ids = sorted(_processed_message_timestamps.items(), key=lambda x: x[1])
-                for old_id, _ in sorted_ids[:-1000]:
-                    del _processed_message_timestamps[old_id]
+            logger.debug("✅ Message ID '%s' cached for deduplication", message_id)
         else:
-            print(f"ℹ️  No message ID provided - deduplication skipped (will process)")
+            logger.debug("ℹ️  No message ID provided - deduplication skipped (will process)")
 
-        print(f"=" * 50)
-        print(f"✅ ALL FILTERS PASSED - Processing incoming message")
-        print(f"=" * 50)
+        logger.debug("=" * 50)
+        logger.debug("✅ ALL FILTERS PASSED - Processing incoming message")
+        logger.debug("=" * 50)
 
         # Check if message is a status query (format: "status:ticket_id" or "STATUS:TKT-...")
-        status_query_pattern = r'^status\s*:\s*(.+)$'
-        status_match = re.match(status_query_pattern, message_text.strip(), re.IGNORECASE)
+        status_match = _STATUS_QUERY_RE.match(message_text)
 
         if status_match:
             # User is querying status of an issue
-            ticket_id = status_match.group(1).strip()
-            print(f"🔍 STATUS QUERY DETECTED")
-            print(f"   📋 Ticket ID: {ticket_id}")
-            print(f"   📱 From: {from_phone}")
+            ticket_id = status_match.group(1)
+            logger.debug("🔍 STATUS QUERY DETECTED")
+            logger.debug("   📋 Ticket ID: %s", ticket_id)
+            logger.debug("   📱 From: %s", from_phone)
 
             # Look up the issue
             issue = await get_issue_by_ticket_id(ticket_id)
@@ -1139,9 +974,9 @@ async def telerivet_webhook(request: Request):
                     f"Please check the ticket ID and try again.\n"
                     f"कृपया टिकट आईडी जांचें और पुनः प्रयास करें।"
                 )
-                print(f"❌ Ticket {ticket_id} not found in database")
-                print(f"📤 Sending error SMS to {from_phone}")
-                telerivet_service.send_sms(from_phone, error_message)
+                logger.warning("❌ Ticket %s not found in database", ticket_id)
+                logger.debug("📤 Sending error SMS to %s", from_phone)
+                background_tasks.add_task(telerivet_service.send_sms, from_phone, error_message)
 
                 return {
                     "status": "error",
@@ -1150,53 +985,40 @@ async def telerivet_webhook(request: Request):
                 }
 
             # Send issue details
-            print(f"✅ Ticket found in database")
-            print(f"📤 Sending issue details SMS to {from_phone}")
-            issue_dict = issue.dict() if hasattr(issue, 'dict') else issue.__dict__
+            logger.debug("✅ Ticket found in database")
+            logger.debug("📤 Sending issue details SMS to %s", from_phone)
+            issue_dict = issue.model_dump()
 
-            sms_sent = await telerivet_service.send_issue_details_sms(from_phone, issue_dict)
-            print(f"✅ STATUS QUERY COMPLETED - SMS sent: {sms_sent}")
+            background_tasks.add_task(telerivet_service.send_issue_details_sms, from_phone, issue_dict)
+            logger.debug("✅ STATUS QUERY COMPLETED - SMS queued")
 
             return {
                 "status": "success",
                 "message": "Status query processed - issue details sent",
                 "ticket_id": ticket_id,
-                "sms_sent": sms_sent
+                "sms_queued": True
             }
 
         # Check if message is a Yes/No confirmation response
         message_lower = message_text.strip().lower()
-        yes_responses = ["yes", "y", "हाँ", "ha", "haa", "han", "हा"]
-        no_responses = ["no", "n", "नहीं", "nahi", "nahin", "nhi", "नही"]
-
-        if message_lower in yes_responses or message_lower in no_responses:
-            print(f"🔍 CONFIRMATION RESPONSE DETECTED")
-            print(f"   📱 From: {from_phone}")
-            print(f"   ✓/✗ Response: {message_text}")
-
-            # Check if user has any issues awaiting confirmation
-            if issues_collection is not None:
-                pending_issue = await issues_collection.find_one({
-                    "users": from_phone,
-                    "awaiting_user_confirmation": True
-                }, sort=[("updated_at", -1)])  # Get most recent
-            else:
-                # In-memory storage
-                pending_issue = None
-                for issue in reversed(_in_memory_issues):
-                    if from_phone in issue.get("users", []) and issue.get("awaiting_user_confirmation", False):
-                        pending_issue = issue
-                        break
+        if message_lower in YES_RESPONSES or message_lower in NO_RESPONSES:
+            logger.debug("🔍 CONFIRMATION RESPONSE DETECTED")
+            logger.debug("   📱 From: %s", from_phone)
+            logger.debug("   ✓/✗ Response: %s", message_text)
+
+            # Resolve the user's most recent issue awaiting confirmation:
+            # yes marks it completed, no sends it back to in_progress
+            pending_issue = await resolve_pending_confirmation(from_phone, message_lower in YES_RESPONSES)
 
             if not pending_issue:
                 # No pending confirmation found
-                print(f"❌ No pending confirmation found for {from_phone}")
+                logger.warning("❌ No pending confirmation found for %s", from_phone)
                 error_message = (
                     f"ℹ️ No pending confirmation / कोई लंबित पुष्टि नहीं\n\n"
                     f"You don't have any issues awaiting confirmation.\n"
                     f"आपके पास पुष्टि की प्रतीक्षा में कोई मुद्दा नहीं है।"
                 )
-                telerivet_service.send_sms(from_phone, error_message)
+                background_tasks.add_task(telerivet_service.send_sms, from_phone, error_message)
                 return {
                     "status": "error",
                     "message": "No pending confirmation for this user",
@@ -1204,42 +1026,12 @@ async def telerivet_webhook(request: Request):
                 }
 
             ticket_id = pending_issue["ticket_id"]
-            print(f"✅ Found pending confirmation for ticket: {ticket_id}")
-
-            # Determine new status based on response
-            if message_lower in yes_responses:
-                new_status = "completed"
-                print(f"✅ User confirmed completion - marking as COMPLETED")
-            else:
-                new_status = "in_progress"
-                print(f"❌ User rejected completion - marking as IN_PROGRESS")
-
-            # Update the status
-            update_data = {
-                "status": new_status,
-                "awaiting_user_confirmation": False,
-                "updated_at": datetime.now().strftime("%H:%M %d-%m-%Y")
-            }
-
-            if new_status == "completed":
-                update_data["completed_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
-
-            if issues_collection is not None:
-                await issues_collection.update_one(
-                    {"ticket_id": ticket_id},
-                    {"$set": update_data}
-                )
-            else:
-                # Update in-memory storage
-                for issue in _in_memory_issues:
-                    if issue.get("ticket_id") == ticket_id:
-                        issue.update(update_data)
-                        break
-
-            print(f"✅ Status updated to: {new_status}")
+            new_status = pending_issue["status"]
+            logger.debug("✅ Resolved pending confirmation for ticket: %s", ticket_id)
+            logger.debug("✅ Status updated to: %s", new_status)
 
             # Send confirmation SMS
-            if message_lower in yes_responses:
+            if message_lower in YES_RESPONSES:
                 confirmation_message = (
                     f"✅ Confirmation Received / पुष्टि प्राप्त हुई\n\n"
                     f"🎫 Ticket: {ticket_id}\n\n"
@@ -1258,8 +1050,8 @@ async def telerivet_webhook(request: Request):
                     f"हमारी टीम इस पर काम जारी रखेगी।"
                 )
 
-            print(f"📤 Sending confirmation SMS to {from_phone}")
-            telerivet_service.send_sms(from_phone, confirmation_message)
+            logger.debug("📤 Sending confirmation SMS to %s", from_phone)
+            background_tasks.add_task(telerivet_service.send_sms, from_phone, confirmation_message)
 
             return {
                 "status": "success",
@@ -1269,51 +1061,66 @@ async def telerivet_webhook(request: Request):
                 "new_status": new_status
             }
 
-        print("=" * 50)
-        print("📝 NEW ISSUE CREATION FLOW")
-        print(f"   📱 From: {from_phone}")
-        print(f"   💬 Message: {message_text[:50]}...")
-        print("=" * 50)
-
-        # Extract issue information using Gemini
-        try:
-            print("🤖 Starting Gemini AI analysis...")
-            analysis_result = await analyze_text(message_text)
-            print(f"✅ Gemini AI analysis complete")
-            print(f"   📂 Category: {analysis_result.get('category')}")
-            print(f"   📌 Title: {analysis_result.get('title')}")
-            print(f"   📍 Address: {analysis_result.get('address')}")
-        except Exception as e:
-            print(f"❌ Gemini AI analysis failed: {e}")
-            logger.error(f"Gemini AI error: {e}")
-            return {"status": "error", "message": f"AI analysis failed: {str(e)}"}
+        logger.debug("=" * 50)
+        logger.debug("📝 NEW ISSUE CREATION FLOW")
+        logger.debug("   📱 From: %s", from_phone)
+        logger.debug("   💬 Message: %s...", message_text[:50])
+        logger.debug("=" * 50)
 
         # Create content hash for duplicate detection
         content_hash = await create_content_hash(message_text, None)
-        print(f"✅ Content hash created: {content_hash[:16]}...")
+        logger.debug("✅ Content hash created: %s...", content_hash[:16])
 
-        # Check if issue already exists
-        print("🔍 Checking for duplicate issues...")
-        existing_issue = await find_existing_issue(
-            content_hash,
-            message_text,
-            None,
-            analysis_result["category"],
-            from_phone  # Use phone number as identifier
-        )
+        # Start the Gemini analysis while probing for an exact duplicate by
+        # content hash - a resubmission doesn't need it, so it is cancelled then
+        logger.debug("🤖 Starting Gemini AI analysis...")
+        analysis_task = asyncio.create_task(analyze_text(message_text))
 
+        logger.debug("🔍 Checking for duplicate issues...")
+        try:
+            existing_issue = await find_existing_issue(content_hash)
+        except BaseException:
+            # Nothing will await the analysis now - don't leave it running orphaned
+            analysis_task.cancel()
+            raise
         if existing_issue:
-            print(f"🔄 DUPLICATE DETECTED!")
-            print(f"   📋 Existing Ticket: {existing_issue.ticket_id}")
-            print(f"   👥 Current reporters: {existing_issue.issue_count}")
-            print(f"   📱 Adding {from_phone} to reporters list")
+            analysis_task.cancel()
+            logger.debug("⏭️  Exact duplicate - Gemini AI analysis cancelled")
+        else:
+            # Extract issue information using Gemini
+            try:
+                analysis_result = await analysis_task
+                logger.debug("✅ Gemini AI analysis complete")
+                logger.debug("   📂 Category: %s", analysis_result.get('category'))
+                logger.debug("   📌 Title: %s", analysis_result.get('title'))
+                logger.debug("   📍 Address: %s", analysis_result.get('address'))
+            except Exception as e:
+                logger.error("Gemini AI analysis failed: %s", e)
+                return {"status": "error", "message": f"AI analysis failed: {str(e)}"}
+
+            # Check for a similar issue in the same category
+            existing_issue = await find_existing_issue(
+                content_hash,
+                message_text,
+                None,
+                analysis_result["category"],
+                from_phone  # Use phone number as identifier
+            )
+
+        if existing_issue:
+            logger.debug("🔄 DUPLICATE DETECTED!")
+            logger.debug("   📋 Existing Ticket: %s", existing_issue.ticket_id)
+            logger.debug("   👥 Current reporters: %s", existing_issue.issue_count)
+            logger.debug("   📱 Adding %s to reporters list", from_phone)
 
             # Update existing issue with the new phone number
             updated_issue = await update_existing_issue(existing_issue.id, from_phone)
 
-            # Send SMS confirmation with full details
-            print(f"📤 Sending duplicate confirmation SMS to {from_phone}...")
-            sms_sent = await telerivet_service.send_ticket_confirmation_sms(
+            # Send SMS confirmation with full details - after the response, so
+            # Telerivet gets its 200 without waiting on translations and the SMS API
+            logger.debug("📤 Sending duplicate confirmation SMS to %s...", from_phone)
+            background_tasks.add_task(
+                telerivet_service.send_ticket_confirmation_sms,
                 phone=from_phone,
                 ticket_id=updated_issue.ticket_id,
                 category=updated_issue.category,
@@ -1321,22 +1128,22 @@ async def telerivet_webhook(request: Request):
                 address=updated_issue.address,
                 description=updated_issue.description
             )
-            print(f"✅ DUPLICATE HANDLING COMPLETED - SMS sent: {sms_sent}")
+            logger.debug("✅ DUPLICATE HANDLING COMPLETED - SMS queued")
 
             return {
                 "status": "success",
                 "message": "Duplicate issue - added to reporters",
                 "ticket_id": updated_issue.ticket_id,
                 "issue_count": updated_issue.issue_count,
-                "sms_sent": sms_sent
+                "sms_queued": True
             }
 
-        print("✨ No duplicate found - Creating NEW issue...")
+        logger.debug("✨ No duplicate found - Creating NEW issue...")
 
         # Generate unique ticket ID
-        ticket_id = f"TKT-{datetime.now().strftime('%d%m%Y')}-{str(uuid.uuid4())[:8].upper()}"
-        current_datetime = datetime.now().strftime("%H:%M %d-%m-%Y")
-        print(f"   🎫 Generated ticket ID: {ticket_id}")
+        now = now_dt()
+        ticket_id = new_ticket_id()
+        logger.debug("   🎫 Generated ticket ID: %s", ticket_id)
 
         # Create new issue
         new_issue_data = {
@@ -1348,13 +1155,13 @@ async def telerivet_webhook(request: Request):
             "title": analysis_result["title"],
             "photo": None,
             "status": "new",
-            "created_at": current_datetime,
+            "created_at": now,
             "users": [from_phone],  # Store phone number
             "issue_count": 1,
             "content_hash": content_hash,
             "original_text": message_text,
             "updated_by_email": from_phone,
-            "updated_at": current_datetime,
+            "updated_at": now,
             "in_progress_at": None,
             "completed_at": None,
             "admin_completed_at": None,
@@ -1364,16 +1171,18 @@ async def telerivet_webhook(request: Request):
         }
 
         # Save to database
-        print(f"💾 Saving new issue to database...")
+        logger.debug("💾 Saving new issue to database...")
         created_issue = await create_new_issue(new_issue_data)
-        print(f"✅ Issue saved to database")
-        print(f"   🎫 Ticket ID: {created_issue.ticket_id}")
-        print(f"   📂 Category: {created_issue.category}")
-        print(f"   📍 Address: {created_issue.address}")
-
-        # Send SMS confirmation with full details
-        print(f"📤 Sending new issue confirmation SMS to {from_phone}...")
-        sms_sent = await telerivet_service.send_ticket_confirmation_sms(
+        logger.debug("✅ Issue saved to database")
+        logger.debug("   🎫 Ticket ID: %s", created_issue.ticket_id)
+        logger.debug("   📂 Category: %s", created_issue.category)
+        logger.debug("   📍 Address: %s", created_issue.address)
+
+        # Send SMS confirmation with full details - after the response, so
+        # Telerivet gets its 200 without waiting on translations and the SMS API
+        logger.debug("📤 Sending new issue confirmation SMS to %s...", from_phone)
+        background_tasks.add_task(
+            telerivet_service.send_ticket_confirmation_sms,
             phone=from_phone,
             ticket_id=created_issue.ticket_id,
             category=created_issue.category,
@@ -1381,23 +1190,23 @@ async def telerivet_webhook(request: Request):
             address=created_issue.address,
             description=created_issue.description
         )
-        print(f"✅ NEW ISSUE CREATION COMPLETED - SMS sent: {sms_sent}")
-        print("=" * 50)
+        logger.debug("✅ NEW ISSUE CREATION COMPLETED - SMS queued")
+        logger.debug("=" * 50)
 
-        logger.info(f"New issue created successfully: {ticket_id}")
+        logger.info("New issue created successfully: %s", ticket_id)
 
         return {
             "status": "success",
             "message": "New issue created",
             "ticket_id": created_issue.ticket_id,
             "category": created_issue.category,
-            "sms_sent": sms_sent
+            "sms_queued": True
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing Telerivet webhook: {str(e)}")
+        logger.error("Error processing Telerivet webhook: %s", e)
         return {
             "status": "error",
             "message": "Failed to process message"
@@ -1413,35 +1222,28 @@ async def check_telerivet_phone_status():
     Useful for debugging SMS delivery issues
     """
     try:
-        import requests
-
         if not telerivet_service.is_configured:
             return {
                 "error": "Telerivet not configured",
                 "configured": False
             }
 
-        # Get phone status
         phone_url = f"{telerivet_service.base_url}/projects/{telerivet_service.project_id}/phones/{telerivet_service.phone_id}"
-
-        phone_response = requests.get(
-            phone_url,
-            auth=(telerivet_service.api_key, ''),
-            timeout=10
-        )
-
-        phone_data = phone_response.json() if phone_response.status_code == 200 else {}
-
-        # Get recent messages
         messages_url = f"{telerivet_service.base_url}/projects/{telerivet_service.project_id}/messages"
 
-        messages_response = requests.get(
-            messages_url,
-            auth=(telerivet_service.api_key, ''),
-            params={"limit": 10, "direction": "outgoing"},
-            timeout=10
+        # Get phone status and recent messages concurrently over the service's
+        # pooled, authenticated session - off the event loop
+        phone_response, messages_response = await asyncio.gather(
+            asyncio.to_thread(telerivet_service.session.get, phone_url, timeout=10),
+            asyncio.to_thread(
+                telerivet_service.session.get,
+                messages_url,
+                params={"limit": 10, "direction": "outgoing"},
+                timeout=10
+            )
         )
 
+        phone_data = phone_response.json() if phone_response.status_code == 200 else {}
         messages_data = messages_response.json() if messages_response.status_code == 200 else {}
 
         return {
@@ -1477,7 +1279,7 @@ async def check_telerivet_phone_status():
         }
 
     except Exception as e:
-        logger.error(f"Error checking Telerivet status: {e}")
+        logger.error("Error checking Telerivet status: %s", e)
         return {
             "error": str(e),
             "configured": telerivet_service.is_configured
@@ -1511,10 +1313,10 @@ async def telerivet_delivery_status_webhook(request: Request):
             form_data = await request.form()
             webhook_data = dict(form_data)
 
-        print("=" * 50)
-        print("DELIVERY STATUS WEBHOOK:")
-        print(f"Webhook data: {webhook_data}")
-        print("=" * 50)
+        logger.debug("=" * 50)
+        logger.debug("DELIVERY STATUS WEBHOOK:")
+        logger.debug("Webhook data: %s", webhook_data)
+        logger.debug("=" * 50)
 
         # Extract key delivery information
         message_id = webhook_data.get('id', webhook_data.get('message_id', ''))
@@ -1524,30 +1326,10 @@ async def telerivet_delivery_status_webhook(request: Request):
         error_code = webhook_data.get('error_code', '')
 
         # Log the delivery status
-        log_message = f"""
-        SMS Delivery Status Update:
-        - Message ID: {message_id}
-        - To Number: {to_number}
-        - Status: {status}
-        - Error Code: {error_code}
-        - Error Message: {error_message}
-        """
-
         if error_message or error_code:
-            logger.error(log_message)
-            print(f"❌ SMS DELIVERY FAILED: {error_message} (Code: {error_code})")
-        elif status == 'sent':
-            logger.info(log_message)
-            print(f"✅ SMS SENT: Message {message_id} to {to_number}")
-        elif status == 'delivered':
-            logger.info(log_message)
-            print(f"✅ SMS DELIVERED: Message {message_id} to {to_number}")
-        elif status == 'queued':
-            logger.info(log_message)
-            print(f"📤 SMS QUEUED: Message {message_id} to {to_number}")
+            logger.error("SMS delivery failed - message %s to %s: %s (code: %s)", message_id, to_number, error_message, error_code)
         else:
-            logger.info(log_message)
-            print(f"📊 SMS STATUS: {status} for message {message_id}")
+            logger.info("SMS delivery status %s - message %s to %s", status, message_id, to_number)
 
         return {
             "status": "received",
@@ -1556,8 +1338,7 @@ async def telerivet_delivery_status_webhook(request: Request):
         }
 
     except Exception as e:
-        logger.error(f"Error processing delivery status webhook: {str(e)}")
-        print(f"❌ Error in delivery status webhook: {str(e)}")
+        logger.error("Error processing delivery status webhook: %s", e)
         return {
             "status": "error",
             "message": f"Failed to process delivery status: {str(e)}"
@@ -1568,37 +1349,43 @@ async def telerivet_delivery_status_webhook(request: Request):
 @app.on_event("startup")
 async def startup_event():
     """Initialize default departments on application startup"""
+    warm_up_models()
+    await warm_up_connection_pool()
+    await ensure_indexes()
+    await backfill_issue_assigned_flags()
+    await backfill_issue_content_hashes()
     await auth_service.initialize_default_departments()
     
     # Initialize departments with categories
+    created_at = now_dt()
     default_departments_with_categories = [
         {
             "name": "Electricity Department", 
             "description": "Handles electrical issues and street lighting",
             "categories": ["Electricity & Streetlights"],
             "is_active": True,
-            "created_at": datetime.now().strftime("%H:%M %d-%m-%Y")
+            "created_at": created_at
         },
         {
             "name": "Water Supply Department",
             "description": "Manages water supply and drainage systems", 
             "categories": ["Water & Drainage"],
             "is_active": True,
-            "created_at": datetime.now().strftime("%H:%M %d-%m-%Y")
+            "created_at": created_at
         },
         {
             "name": "Road Maintenance Department",
             "description": "Manages road maintenance and transport infrastructure",
             "categories": ["Roads & Transport"], 
             "is_active": True,
-            "created_at": datetime.now().strftime("%H:%M %d-%m-%Y")
+            "created_at": created_at
         },
         {
             "name": "Sanitation Department",
             "description": "Handles waste collection and sanitation issues",
             "categories": ["Sanitation & Waste"],
             "is_active": True, 
-            "created_at": datetime.now().strftime("%H:%M %d-%m-%Y")
+            "created_at": created_at
         }
     ]
     
@@ -1607,264 +1394,9 @@ async def startup_event():
         existing_depts = await get_all_departments()
         existing_names = {dept.name for dept in existing_depts}
         
-        from .database import create_department
-        for dept_data in default_departments_with_categories:
-            if dept_data["name"] not in existing_names:
-                await create_department(dept_data)
-                print(f"Created department: {dept_data['name']}")
+        from .database import create_departments
+        missing = [d for d in default_departments_with_categories if d["name"] not in existing_names]
+        for dept in await create_departments(missing):
+            logger.info("Created department: %s", dept.name)
     except Exception as e:
-        print(f"Error initializing departments: {e}")
-        
-        app = FastAPI(
-    title="Municipal Voice Assistant API",
-    description="API for processing municipal issues from voice input",
-    version="1.0.0"
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # For production, you should restrict this
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# --- Startup Event ---
-@app.on_event("startup")
-async def startup_event():
-    """Initialize default departments on application startup"""
-    await auth_service.initialize_default_departments()
-
-
-# --- Root and Health Check ---
-@app.get("/")
-async def root():
-    return {"message": "Municipal Voice Assistant API is running!"}
-
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().strftime("%H:%M %d-%m-%Y")}
-
-
-# --- Issue Routes ---
-
-@app.post("/submit-issue", response_model=IssueResponse)
-async def submit_issue(issue_request: IssueRequest):
-    """Submit a new municipal issue or update existing one if duplicate"""
-    # This function appears correct and is left as is.
-    try:
-        location_dict = issue_request.location.model_dump() if issue_request.location else None
-        content_hash = await create_content_hash(issue_request.text, location_dict)
-        analysis_result = await analyze_text(issue_request.text)
-        
-        existing_issue = await find_existing_issue(
-            content_hash, issue_request.text, location_dict,
-            analysis_result["category"], issue_request.email
-        )
-        
-        if existing_issue:
-            updated_issue = await update_existing_issue(existing_issue.id, issue_request.email)
-            return updated_issue
-        
-        ticket_id = f"TKT-{datetime.now().strftime('%d%m%Y')}-{str(uuid.uuid4())[:8].upper()}"
-        current_datetime = datetime.now().strftime("%H:%M %d-%m-%Y")
-        
-        new_issue_data = {
-            "ticket_id": ticket_id, "category": analysis_result["category"],
-            "address": analysis_result["address"], "location": location_dict,
-            "description": analysis_result["description"], "title": analysis_result["title"],
-            "photo": issue_request.photo, "status": "new", "created_at": current_datetime,
-            "users": [issue_request.email], "issue_count": 1, "content_hash": content_hash,
-            "original_text": issue_request.text, "updated_by_email": issue_request.email,
-            "updated_at": current_datetime
-        }
-        
-        created_issue = await create_new_issue(new_issue_data)
-        return created_issue
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing issue: {str(e)}")
-
-# ... (All your other non-conflicting routes for issues, etc., go here) ...
-# I am including the routes from your original file.
-
-@app.get("/issues", response_model=List[IssueResponse])
-async def get_issues(category: str = None, status: str = None, limit: int = 100, skip: int = 0):
-    all_issues = await get_all_issues()
-    filtered_issues = [
-        issue for issue in all_issues
-        if (category is None or issue.category == category) and (status is None or issue.status == status)
-    ]
-    return filtered_issues[skip : skip + limit]
-
-@app.get("/issues/categories")
-async def get_issue_categories():
-    departments = await get_all_departments()
-    categories = set()
-    for dept in departments:
-        categories.update(dept.categories)
-    return list(categories)
-
-@app.put("/issues/{ticket_id}/status")
-async def update_issue_status(ticket_id: str, status_update: StatusUpdateRequest):
-    """Update the status of an existing issue by ticket ID"""
-    try:
-        print(f"📧 Status update request - Ticket: {ticket_id}, New Status: {status_update.status}")
-        
-        # Validate status value
-        valid_statuses = ["new", "in_progress", "in progress", "admin_completed"]
-        
-        # Normalize the status
-        normalized_status = status_update.status
-        if status_update.status == "in progress":
-            normalized_status = "in_progress"
-        
-        if status_update.status not in valid_statuses:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
-            )
-        
-        # Get the issue first to capture old status
-        all_issues = await get_all_issues()
-        current_issue = next((i for i in all_issues if i.ticket_id == ticket_id), None)
-        
-        if not current_issue:
-            raise HTTPException(status_code=404, detail=f"Issue with ticket ID {ticket_id} not found")
-        
-        old_status = current_issue.status
-        
-        # Update the issue
-        updated_issue = await update_issue_status_in_db(ticket_id, normalized_status, status_update.email)
-        
-        if not updated_issue:
-            raise HTTPException(status_code=404, detail=f"Issue with ticket ID {ticket_id} not found")
-        
-        return {
-            "message": "Issue status updated successfully",
-            "ticket_id": ticket_id,
-            "old_status": old_status,
-            "new_status": normalized_status,
-            "updated_by_email": status_update.email,
-            "updated_at": datetime.now().strftime("%H:%M %d-%m-%Y"),
-            "notification_sent": len(updated_issue.get("users", [])) > 0
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Error in update_issue_status: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error updating issue status: {str(e)}")
-
-# --- Worker and Auth Routes ---
-
-@app.post("/workers/register", response_model=UserResponse)
-async def register_worker(worker_data: dict):
-    """Register a new worker"""
-    try:
-        # Automatically add the 'role' for worker registration
-        worker_data['role'] = UserRole.WORKER
-        
-        # This is the final fix: Let Pydantic create the object directly from the dictionary.
-        user_registration = UserRegistration(**worker_data)
-        
-        # Call the auth service with the correctly populated object
-        result = await auth_service.register_user(user_registration)
-        
-        if result["success"]:
-            # The result from the service contains a nested 'user' object
-            return UserResponse(**result["user"])
-        else:
-            raise HTTPException(status_code=400, detail=result.get("message", "Registration failed."))
-
-    except Exception as e:
-        # This will log the actual error to your Render logs for easier debugging
-        print(f"CRASH in /workers/register: {e}") 
-        raise HTTPException(status_code=500, detail=f"Worker registration failed: {str(e)}")
-
-
-@app.post("/workers/login")
-async def worker_login(login_data: UserLogin):
-    """Worker login endpoint"""
-    try:
-        result = await auth_service.authenticate_user(login_data.email, login_data.password)
-        
-        if result["success"] and result["user"]["role"] == UserRole.WORKER.value:
-            return result
-        elif result["success"]:
-            raise HTTPException(status_code=403, detail="Access denied. Worker account required.")
-        else:
-            raise HTTPException(status_code=401, detail=result["message"])
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Worker login failed: {str(e)}")
-
-
-@app.get("/workers", response_model=List[WorkerProfile])
-async def get_workers(department_id: str = None):
-    """Get all workers, optionally filtered by department"""
-    if department_id:
-        return await get_workers_by_department(department_id)
-    else:
-        return await get_all_workers()
-
-
-@app.get("/workers/profile/{email}", response_model=WorkerProfile)
-async def get_worker_profile_endpoint(email: str):
-    """Get worker profile by email"""
-    worker = await auth_service.get_user_profile(email)
-    if worker["success"]:
-        return WorkerProfile(**worker["user"])
-    else:
-        raise HTTPException(status_code=404, detail="Worker not found")
-
-
-# --- Department Route ---
-
-@app.get("/departments", response_model=List[Department])
-async def get_departments_endpoint():
-    """Get all active departments"""
-    return await get_all_departments()
-
-
-# --- Assignment Routes ---
-
-@app.get("/assignments", response_model=List[IssueAssignment])
-async def get_all_assignments_endpoint():
-    """Get all assignments"""
-    return await get_all_assignments()
-
-
-@app.post("/assignments", response_model=AssignmentResponse)
-async def create_assignment_endpoint(assignment_request: AssignmentRequest):
-    """Create a new assignment"""
-    # This logic assumes 'assigned_by' comes from an auth system later.
-    # For now, we'll hardcode it or take it as a query param.
-    assigned_by_email = "admin@example.com"
-
-    # Verify issue and worker exist
-    issue = await get_assignment_by_ticket(assignment_request.ticket_id) # Simplified
-    if not issue:
-        raise HTTPException(status_code=404, detail="Issue not found")
-    
-    worker = await get_worker_by_email(assignment_request.assigned_to)
-    if not worker:
-        raise HTTPException(status_code=404, detail="Worker not found")
-
-    assignment_data = assignment_request.model_dump()
-    assignment_data["assigned_by"] = assigned_by_email
-    assignment_data["assigned_at"] = datetime.now().strftime("%H:%M %d-%m-%Y")
-    assignment_data["status"] = "assigned"
-
-    new_assignment = await create_issue_assignment(assignment_data)
-    
-    # Update issue status
-    await update_issue_status_in_db(assignment_request.ticket_id, "in_progress", assigned_by_email)
-    
-    return new_assignment
-
-@app.get("/assignments/worker/{worker_email}", response_model=List[IssueAssignment])
-async def get_worker_assignments_endpoint(worker_email: str):
-    """Get all assignments for a specific worker"""
-    return await get_assignments_by_worker(worker_email)
\ No newline at end of file
+        logger.error("Error initializing departments: %s", e)
@@ -1,10 +1,13 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, Field, field_validator, BeforeValidator
+from typing import Optional, List, Annotated
+from .utils import now_fmt, format_timestamp
 from bson import ObjectId
 from enum import Enum
 from pydantic import ConfigDict
 
+# Timestamps are stored as BSON dates and exposed in TIMESTAMP_FORMAT
+Timestamp = Annotated[str, BeforeValidator(format_timestamp)]
+
 class Location(BaseModel):
     longitude: float
     latitude: float
@@ -25,20 +28,30 @@ class IssueResponse(BaseModel):
     title: str
     photo: Optional[str] = None
     status: str
-    created_at: str
+    created_at: Timestamp
     users: List[str]
     issue_count: int
     original_text: Optional[str] = None
-    in_progress_at: Optional[str] = None
-    completed_at: Optional[str] = None
+    in_progress_at: Optional[Timestamp] = None
+    completed_at: Optional[Timestamp] = None
     updated_by_email: Optional[str] = None
-    updated_at: Optional[str] = None
-    admin_completed_at: Optional[str] = None
-    user_completed_at: Optional[str] = None
+    updated_at: Optional[Timestamp] = None
+    admin_completed_at: Optional[Timestamp] = None
+    user_completed_at: Optional[Timestamp] = None
     admin_completed_by: Optional[str] = None
     user_completed_by: Optional[str] = None
     awaiting_user_confirmation: Optional[bool] = None
 
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_db(cls, issue: "IssueDB") -> "IssueResponse":
+        """
+        Build the API response straight from a stored issue. IssueDB is already
+        validated and shares these fields, so skip re-validating them.
+        """
+        return cls.model_construct(**{name: getattr(issue, name) for name in cls.model_fields})
+
 class IssueDB(BaseModel):
     id: Optional[str] = Field(None, alias="_id")
     ticket_id: str
@@ -49,30 +62,42 @@ class IssueDB(BaseModel):
     title: str
     photo: Optional[str] = None
     status: str
-    created_at: str
+    created_at: Timestamp
     users: List[str]
     issue_count: int
     content_hash: str
     original_text: str
-    in_progress_at: Optional[str] = None
-    completed_at: Optional[str] = None
+    in_progress_at: Optional[Timestamp] = None
+    completed_at: Optional[Timestamp] = None
     updated_by_email: Optional[str] = None
-    updated_at: Optional[str] = None
-    admin_completed_at: Optional[str] = None
-    user_completed_at: Optional[str] = None
+    updated_at: Optional[Timestamp] = None
+    admin_completed_at: Optional[Timestamp] = None
+    user_completed_at: Optional[Timestamp] = None
     admin_completed_by: Optional[str] = None
     user_completed_by: Optional[str] = None
     awaiting_user_confirmation: Optional[bool] = None
+    assigned: bool = False
 
     model_config = ConfigDict(
         populate_by_name=True,
         json_encoders={ObjectId: str}
     )
 
+class Status(str, Enum):
+    NEW = "new"
+    IN_PROGRESS = "in_progress"
+    ADMIN_COMPLETED = "admin_completed"
+
 class StatusUpdateRequest(BaseModel):
-    status: str
+    status: Status
     email: EmailStr
 
+    @field_validator("status", mode="before")
+    @classmethod
+    def normalize_status(cls, value):
+        """Accept "in progress" as an alias for "in_progress" """
+        return "in_progress" if value == "in progress" else value
+
 class UserEmailRequest(BaseModel):
     email: EmailStr
 
@@ -85,7 +110,7 @@ class CompletionResponse(BaseModel):
     ticket_id: str
     completion_type: str
     completed_by: str
-    completed_at: str
+    completed_at: Timestamp
     current_status: str
     is_fully_completed: bool
 
@@ -100,7 +125,7 @@ class Department(BaseModel):
     description: Optional[str] = None
     categories: List[str] = []
     is_active: bool = True
-    created_at: str = Field(default_factory=lambda: datetime.now().strftime("%H:%M %d-%m-%Y"))
+    created_at: Timestamp = Field(default_factory=now_fmt)
 
     model_config = ConfigDict(
         populate_by_name=True,
@@ -119,7 +144,7 @@ class Department(BaseModel):
     description: Optional[str] = Field(None, description="Department description")
     categories: List[str] = Field(default_factory=list, description="Issue categories handled by this department")
     is_active: bool = Field(default=True, description="Whether department is active")
-    created_at: str = Field(default_factory=lambda: datetime.now().strftime("%H:%M %d-%m-%Y"))
+    created_at: Timestamp = Field(default_factory=now_fmt)
 
     class Config:
         allow_population_by_field_name = True
@@ -144,8 +169,8 @@ class WorkerProfile(BaseModel):
     is_available: bool = Field(default=True, description="Whether worker is available for new assignments")
     specialization: Optional[str] = Field(None, description="Worker's primary specialization")
     experience_years: int = Field(default=0, description="Years of experience")
-    created_at: str = Field(default_factory=lambda: datetime.now().strftime("%H:%M %d-%m-%Y"))
-    updated_at: Optional[str] = Field(None, description="Last update timestamp")
+    created_at: Timestamp = Field(default_factory=now_fmt)
+    updated_at: Optional[Timestamp] = Field(None, description="Last update timestamp")
 
     class Config:
         allow_population_by_field_name = True
@@ -176,7 +201,7 @@ class UserResponse(BaseModel):
     role: UserRole
     phone: Optional[str] = None
     is_active: bool = True
-    created_at: str
+    created_at: Timestamp
     # Worker-specific fields
     employee_id: Optional[str] = None
     department_id: Optional[str] = None
@@ -189,10 +214,10 @@ class IssueAssignment(BaseModel):
     ticket_id: str
     assigned_to: str
     assigned_by: str
-    assigned_at: str = Field(default_factory=lambda: datetime.now().strftime("%H:%M %d-%m-%Y"))
+    assigned_at: Timestamp = Field(default_factory=now_fmt)
     status: str = "assigned"
     notes: Optional[str] = None
-    completed_at: Optional[str] = None
+    completed_at: Optional[Timestamp] = None
 
     model_config = ConfigDict(
         populate_by_name=True,
@@ -212,7 +237,7 @@ class AssignmentResponse(BaseModel):
     ticket_id: str
     assigned_to: str
     assigned_by: str
-    assigned_at: str
+    assigned_at: Timestamp
     status: str
     
 class CompletionRequest(BaseModel):
@@ -224,6 +249,47 @@ class CompletionResponse(BaseModel):
     ticket_id: str
     completion_type: str
     completed_by: str
-    completed_at: str
+    completed_at: Timestamp
     current_status: str
-    is_fully_completed: bool
\ No newline at end of file
+    is_fully_completed: bool
+
+def warm_up_models():
+    """
+    Push sample data through the hot models once at startup, so the first
+    request doesn't pay for email validation and timestamp parsing setup.
+    """
+    created_at = now_fmt()
+    issue = IssueDB.model_validate({
+        "_id": "warmup",
+        "ticket_id": "warmup",
+        "category": "warmup",
+        "address": "warmup",
+        "location": {"longitude": 0.0, "latitude": 0.0},
+        "description": "warmup",
+        "title": "warmup",
+        "status": "pending",
+        "created_at": created_at,
+        "users": ["warmup@example.com"],
+        "issue_count": 1,
+        "content_hash": "warmup",
+        "original_text": "warmup",
+    })
+    IssueResponse.model_validate(issue.model_dump()).model_dump()
+    IssueRequest.model_validate({"text": "warmup", "email": "warmup@example.com", "name": "warmup"})
+    WorkerProfile.model_validate({
+        "user_id": "warmup",
+        "email": "warmup@example.com",
+        "name": "warmup",
+        "employee_id": "warmup",
+        "department_id": "warmup",
+        "department_name": "warmup",
+    }).model_dump(by_alias=True)
+    AssignmentResponse.model_validate({
+        "message": "warmup",
+        "assignment_id": "warmup",
+        "ticket_id": "warmup",
+        "assigned_to": "warmup@example.com",
+        "assigned_by": "warmup@example.com",
+        "assigned_at": created_at,
+        "status": "assigned",
+    }).model_dump()
@@ -1,6 +1,8 @@
 import os
+import asyncio
 import requests
-from typing import Optional, Dict
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,13 @@ class TelerivetService:
         # Base URL for Telerivet API
         self.base_url = "https://api.telerivet.com/v1"
 
+        # One keep-alive session for every API call so each SMS doesn't pay for
+        # a fresh TCP/TLS handshake. The pool is sized for the bulk sender's
+        # default concurrency since sends run on worker threads.
+        self.session = requests.Session()
+        self.session.auth = (self.api_key or '', '')  # Telerivet uses API key as username
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=10))
+
         # Check if Telerivet is configured
         self.is_configured = all([
             self.api_key,
@@ -64,9 +73,8 @@ class TelerivetService:
 
             print(f"📦 Payload: {payload}")
 
-            response = requests.post(
+            response = self.session.post(
                 url,
-                auth=(self.api_key, ''),  # Telerivet uses API key as username
                 json=payload,
                 timeout=10
             )
@@ -267,7 +275,7 @@ class TelerivetService:
 
             print(f"📨 SMS message length: {len(message)} characters")
 
-            return self.send_sms(phone, message)
+            return await asyncio.to_thread(self.send_sms, phone, message)
 
         except Exception as e:
             print(f"❌ Error creating bilingual message: {e}")
@@ -280,7 +288,7 @@ class TelerivetService:
                 f"Category: {category}\n\n"
                 f"We will process your request shortly."
             )
-            return self.send_sms(phone, simple_message)
+            return await asyncio.to_thread(self.send_sms, phone, simple_message)
 
     def send_status_update_sms(self, phone: str, ticket_id: str, old_status: str, new_status: str) -> bool:
         """
@@ -312,26 +320,25 @@ class TelerivetService:
 
         return self.send_sms(phone, message)
 
-    async def send_status_update_sms_bilingual(self, phone: str, ticket_id: str, old_status: str, new_status: str) -> bool:
+    async def build_status_update_message_bilingual(self, ticket_id: str, old_status: str, new_status: str) -> str:
         """
-        Send bilingual (English + Hindi) SMS notification about status update
+        Build the bilingual (English + Hindi) status update message
+
+        The text depends only on the ticket and the status change, so it can be
+        built once and sent to every reporter of the issue.
 
         Args:
-            phone: Recipient phone number
             ticket_id: Ticket ID
             old_status: Previous status
             new_status: New status
 
         Returns:
-            bool: True if sent successfully
+            str: SMS message text
         """
         # Import here to avoid circular import
         from .gemini_service import translate_to_hindi
 
         try:
-            print(f"📤 Sending bilingual status update SMS to {phone}")
-            print(f"   Ticket: {ticket_id}, Status: {old_status} → {new_status}")
-
             # Status messages in English
             status_messages_en = {
                 "new": "Registered",
@@ -406,21 +413,81 @@ class TelerivetService:
 
             print(f"📨 Bilingual SMS message length: {len(message)} characters")
 
-            return self.send_sms(phone, message)
+            return message
 
         except Exception as e:
             print(f"❌ Error creating bilingual status update message: {e}")
-            logger.error(f"Error in send_status_update_sms_bilingual: {e}")
+            logger.error(f"Error in build_status_update_message_bilingual: {e}")
 
             # Fallback to simple bilingual message
-            simple_message = (
+            return (
                 f"🔔 Status Update / स्थिति अपडेट\n\n"
                 f"Ticket: {ticket_id}\n"
                 f"New Status: {new_status}\n\n"
                 f"Thank you for your patience.\n"
                 f"आपके धैर्य के लिए धन्यवाद।"
             )
-            return self.send_sms(phone, simple_message)
+
+    async def send_status_update_sms_bilingual(self, phone: str, ticket_id: str, old_status: str, new_status: str) -> bool:
+        """
+        Send bilingual (English + Hindi) SMS notification about status update
+
+        Args:
+            phone: Recipient phone number
+            ticket_id: Ticket ID
+            old_status: Previous status
+            new_status: New status
+
+        Returns:
+            bool: True if sent successfully
+        """
+        print(f"📤 Sending bilingual status update SMS to {phone}")
+        print(f"   Ticket: {ticket_id}, Status: {old_status} → {new_status}")
+
+        message = await self.build_status_update_message_bilingual(ticket_id, old_status, new_status)
+        return await asyncio.to_thread(self.send_sms, phone, message)
+
+    async def send_status_update_sms_bulk(
+        self,
+        phones: List[str],
+        ticket_id: str,
+        old_status: str,
+        new_status: str,
+        max_concurrency: int = 10
+    ) -> int:
+        """
+        Send the bilingual status update SMS to several recipients
+
+        The message is built once, then the API calls run concurrently in worker
+        threads, capped at max_concurrency requests in flight.
+
+        Args:
+            phones: Recipient phone numbers
+            ticket_id: Ticket ID
+            old_status: Previous status
+            new_status: New status
+            max_concurrency: Maximum number of simultaneous API requests
+
+        Returns:
+            int: Number of messages sent successfully
+        """
+        if not phones:
+            return 0
+
+        message = await self.build_status_update_message_bilingual(ticket_id, old_status, new_status)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def send_one(phone: str) -> bool:
+            async with semaphore:
+                return await asyncio.to_thread(self.send_sms, phone, message)
+
+        results = await asyncio.gather(*(send_one(phone) for phone in phones), return_exceptions=True)
+
+        for phone, result in zip(phones, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending status update SMS to {phone}: {result}")
+
+        return sum(1 for result in results if result is True)
 
     async def send_issue_details_sms(self, phone: str, issue_data: dict) -> bool:
         """
@@ -528,7 +595,7 @@ class TelerivetService:
 
             print(f"📨 Issue details SMS length: {len(message)} characters")
 
-            return self.send_sms(phone, message)
+            return await asyncio.to_thread(self.send_sms, phone, message)
 
         except Exception as e:
             print(f"❌ Error creating issue details SMS: {e}")
@@ -542,7 +609,7 @@ class TelerivetService:
                 f"Category / श्रेणी: {issue_data.get('category', 'N/A')}\n\n"
                 f"Created / बनाया गया: {issue_data.get('created_at', 'N/A')}"
             )
-            return self.send_sms(phone, simple_message)
+            return await asyncio.to_thread(self.send_sms, phone, simple_message)
 
     def get_message_details(self, message_id: str) -> Optional[Dict]:
         """
@@ -561,9 +628,8 @@ class TelerivetService:
         try:
             url = f"{self.base_url}/projects/{self.project_id}/messages/{message_id}"
 
-            response = requests.get(
+            response = self.session.get(
                 url,
-                auth=(self.api_key, ''),
                 timeout=10
             )
 
@@ -0,0 +1,23 @@
+from datetime import datetime
+from ulid import ULID
+
+# Format of every timestamp stored on issues, workers and assignments
+TIMESTAMP_FORMAT = "%H:%M %d-%m-%Y"
+
+def now_fmt() -> str:
+    """Return the current local time formatted as TIMESTAMP_FORMAT"""
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
+
+def now_dt() -> datetime:
+    """Return the current local time for storing as a native BSON date"""
+    return datetime.now()
+
+def format_timestamp(value):
+    """Format a stored datetime as TIMESTAMP_FORMAT. Older records stored the string already, so those pass through"""
+    if isinstance(value, datetime):
+        return value.strftime(TIMESTAMP_FORMAT)
+    return value
+
+def new_ticket_id() -> str:
+    """Return a new ticket ID. ULIDs sort by creation time, so inserts stay at the hot end of the ticket_id index"""
+    return f"TKT-{ULID()}"